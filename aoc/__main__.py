@@ -1,54 +1,214 @@
-import argparse
-import sys
-import traceback
-import urllib.error
-from pathlib import Path
-
-from downloader import download_input
-from solutions import solve
-
-parser = argparse.ArgumentParser(
-    prog="aoc",
-    description="Solutions for Advent of Code 2021",
-)
-
-parser.add_argument("day", type=int, help="Solution day to run, between 1 and 25.")
-parser.add_argument(
-    "filename",
-    type=Path,
-    nargs="?",
-    help="Path to puzzle input file. Input will be downloaded if no path is given.",
-)
-
-args = parser.parse_args()
-
-if __name__ == "__main__":
-    try:
-        filename = args.filename
-
-        if filename is None:
-            filename = download_input(args.day)
-
-        if not filename.exists():
-            raise FileNotFoundError("input file does not exist: '%s'" % args.filename)
-
-        with filename.open() as f:
-            input_ = f.read().splitlines()
-
-        solution = solve(args.day, input_)
-        print(solution)
-    except FileNotFoundError as e:
-        sys.stderr.write("aoc: error: %s\n" % e)
-        sys.exit(1)
-    except IndexError as e:
-        sys.stderr.write("aoc: error: %s\n" % e)
-        sys.exit(2)
-    except urllib.error.HTTPError:
-        sys.stderr.write(
-            "aoc: error: error downloading input. Is your token expired?\n"
-        )
-        sys.exit(3)
-    except Exception as e:
-        sys.stderr.write("aoc: error: %s\n" % e)
-        traceback.print_exc()
-        sys.exit(4)
+import argparse
+import sys
+import traceback
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter
+
+from profiling import PROFILE_FOLDER, PROFILERS
+from result_cache import ResultCache
+from runner import (
+    cached_solve,
+    find_input,
+    parse_days,
+    read_input,
+    render_batch,
+    run_batch,
+)
+from solutions import load_solution, solve
+
+# Subcommands and the module whose main() runs each. Modules are only imported
+# when their command runs, so solving a single day starts as fast as possible.
+COMMANDS = {"bench": "bench", "generate": "generators", "serve": "daemon"}
+
+parser = argparse.ArgumentParser(
+    prog="aoc",
+    description="Solutions for Advent of Code 2021",
+    epilog="Run 'aoc bench -h' for the benchmark suite, 'aoc generate -h' for "
+    "synthetic inputs and 'aoc serve -h' for the solver daemon.",
+)
+
+parser.add_argument(
+    "day",
+    help="Solution day to run, between 1 and 25. "
+    "A range like '1-22', a list like '1,3,5' or 'all' runs a batch.",
+)
+parser.add_argument(
+    "filename",
+    type=Path,
+    nargs="?",
+    help="Path to puzzle input file, or a directory of inputs named like 01.txt "
+    "for a batch. Input will be downloaded if no path is given.",
+)
+parser.add_argument(
+    "-p",
+    "--part",
+    type=int,
+    choices=(1, 2),
+    help="Only solve this part. Both parts are solved by default.",
+)
+parser.add_argument(
+    "-j",
+    "--jobs",
+    type=int,
+    help="Worker processes for a batch run. Defaults to one per core.",
+)
+parser.add_argument(
+    "--prefetch",
+    action="store_true",
+    help="Only download the inputs for the selected days, concurrently.",
+)
+parser.add_argument(
+    "--concurrency",
+    type=int,
+    help="Maximum simultaneous input downloads (default 4).",
+)
+parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="Always solve instead of reusing answers stored in the result cache.",
+)
+parser.add_argument(
+    "--daemon",
+    nargs="?",
+    type=Path,
+    const=True,
+    metavar="SOCKET",
+    help="Solve through a daemon started with 'aoc serve', listening on SOCKET "
+    "(default .aoc.sock). Solves in-process if no daemon is running.",
+)
+parser.add_argument(
+    "--profile",
+    choices=PROFILERS.keys(),
+    help="Profile each solve with cProfile (cpu) or tracemalloc (mem).",
+)
+parser.add_argument(
+    "--profile-dir",
+    type=Path,
+    default=PROFILE_FOLDER,
+    help="Directory for profiling artifacts, one set per day (default %(default)s).",
+)
+parser.add_argument(
+    "--top",
+    type=int,
+    default=20,
+    help="Number of entries in profiling reports (default %(default)s).",
+)
+
+
+def run(argv: list[str]) -> int:
+    args = parser.parse_args(argv)
+    args.parts = (1, 2) if args.part is None else (args.part,)
+    if args.prefetch:
+        from downloader import MAX_CONCURRENCY, prefetch
+
+        days = parse_days(args.day)
+        concurrency = args.concurrency or MAX_CONCURRENCY
+        for filename in prefetch(days, concurrency=concurrency):
+            print(filename)
+        return 0
+
+    if not args.day.isdigit():
+        return run_all(parse_days(args.day), args)
+
+    args.day = int(args.day)
+    filename = args.filename
+
+    if filename is None:
+        filename = find_input(args.day)
+
+    if not filename.exists():
+        raise FileNotFoundError("input file does not exist: '%s'" % args.filename)
+
+    if args.daemon is not None:
+        import daemon
+
+        socket_path = daemon.SOCKET_PATH if args.daemon is True else args.daemon
+        print(daemon.solve_with_daemon(args.day, filename, args.parts, socket_path))
+        return 0
+
+    input_ = read_input(filename)
+    if args.profile is None and args.no_cache:
+        print(solve(args.day, input_, args.parts))
+        return 0
+    if args.profile is None:
+        print(cached_solve(args.day, input_, ResultCache(), args.parts))
+        return 0
+
+    from profiling import profile
+
+    solution, report = profile(
+        args.profile,
+        args.day,
+        load_solution(args.day),
+        input_,
+        args.parts,
+        directory=args.profile_dir,
+        top=args.top,
+    )
+    print(solution)
+    print(report)
+    return 0
+
+
+def run_all(days: list[int], args: argparse.Namespace) -> int:
+    inputs = args.filename
+    if inputs is not None and not inputs.is_dir():
+        raise FileNotFoundError("input directory does not exist: '%s'" % inputs)
+
+    start = perf_counter()
+    if inputs is None:
+        from downloader import MAX_CONCURRENCY, prefetch
+
+        prefetch(days, concurrency=args.concurrency or MAX_CONCURRENCY)
+    results = run_batch(
+        days,
+        inputs,
+        args.jobs,
+        profile=args.profile,
+        profile_dir=args.profile_dir,
+        top=args.top,
+        use_cache=not args.no_cache,
+        parts=args.parts,
+    )
+    print(render_batch(results, perf_counter() - start))
+    if args.profile is not None:
+        print(f"Profiles written to {args.profile_dir}")
+
+    failed = [
+        d for d, (solution, _) in results.items() if isinstance(solution, Exception)
+    ]
+    return 4 if failed else 0
+
+
+def _raised(e: Exception, module: str, name: str) -> bool:
+    """Whether `e` is an instance of `module.name`, without importing `module`
+    just to check. An exception of that type can only exist if it was imported.
+    """
+    return module in sys.modules and isinstance(e, getattr(sys.modules[module], name))
+
+
+if __name__ == "__main__":
+    try:
+        argv = sys.argv[1:]
+        if argv and argv[0] in COMMANDS:
+            sys.exit(import_module(COMMANDS[argv[0]]).main(argv[1:]))
+        sys.exit(run(argv))
+    except FileNotFoundError as e:
+        sys.stderr.write("aoc: error: %s\n" % e)
+        sys.exit(1)
+    except IndexError as e:
+        sys.stderr.write("aoc: error: %s\n" % e)
+        sys.exit(2)
+    except Exception as e:
+        if _raised(e, "bench", "RegressionError"):
+            sys.stderr.write("aoc: error: %s\n" % e)
+            sys.exit(5)
+        if _raised(e, "urllib.error", "HTTPError"):
+            sys.stderr.write(
+                "aoc: error: error downloading input. Is your token expired?\n"
+            )
+            sys.exit(3)
+        sys.stderr.write("aoc: error: %s\n" % e)
+        traceback.print_exc()
+        sys.exit(4)
@@ -0,0 +1,284 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import generators
+from runner import find_input, parse_days, read_input
+from solutions import load_solution
+from solutions.shared import Solution
+
+# Slowdowns smaller than this many seconds are treated as noise when comparing
+NOISE_FLOOR = 0.0005
+
+
+class RegressionError(Exception):
+    pass
+
+
+parser = argparse.ArgumentParser(
+    prog="aoc bench",
+    description="Benchmark solutions for Advent of Code 2021",
+)
+
+parser.add_argument(
+    "days",
+    nargs="?",
+    default="all",
+    help="Days to benchmark, e.g. '1', '1-7', '1,3,5' or 'all' (default).",
+)
+parser.add_argument(
+    "-n", "--runs", type=int, default=10, help="Timed runs per day (default 10)."
+)
+parser.add_argument(
+    "-w", "--warmup", type=int, default=1, help="Untimed runs per day (default 1)."
+)
+parser.add_argument(
+    "-p",
+    "--part",
+    type=int,
+    choices=(1, 2),
+    help="Only benchmark this part. Both parts are run by default.",
+)
+parser.add_argument(
+    "-i",
+    "--inputs",
+    type=Path,
+    help="Directory of puzzle inputs named like 01.txt. Inputs are downloaded if omitted.",
+)
+parser.add_argument(
+    "-s",
+    "--scale",
+    help="Benchmark synthetic inputs of this size relative to a real input, "
+    "e.g. '10x', instead of puzzle inputs.",
+)
+parser.add_argument(
+    "--seed", type=int, default=0, help="Seed for synthetic inputs (default 0)."
+)
+parser.add_argument(
+    "--json", type=Path, help="Write results as JSON to this path for later diffing."
+)
+parser.add_argument(
+    "--save-baseline",
+    type=Path,
+    metavar="FILE",
+    help="Save median phase times, peak memory and answers per day as a baseline.",
+)
+parser.add_argument(
+    "--compare",
+    type=Path,
+    metavar="FILE",
+    help="Fail if any day is slower, uses more memory or answers differently "
+    "than the baseline in FILE.",
+)
+parser.add_argument(
+    "-t",
+    "--tolerance",
+    type=float,
+    default=10.0,
+    help="Allowed slowdown or memory growth in percent for --compare "
+    "(default %(default)s).",
+)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Min/median/p95/stddev of a list of timings, in seconds."""
+    if len(samples) > 1:
+        p95 = statistics.quantiles(samples, n=20, method="inclusive")[-1]
+        stddev = statistics.stdev(samples)
+    else:
+        p95 = samples[0]
+        stddev = 0.0
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "p95": p95,
+        "stddev": stddev,
+    }
+
+
+def time_day(
+    day: int, filename: Path, runs: int, warmup: int, parts: tuple[int, ...]
+) -> (dict[str, list[float]], Solution):
+    """Runs a day `warmup + runs` times, recording the time spent in each phase.
+    Phases are 'input', reading the input into the day's INPUT_FORMAT, plus
+    'parse', 'part1' and 'part2' for days that solve parts separately, or
+    'solve' for days with a single `main`.
+    """
+    solution = load_solution(day)
+    samples = dict()
+    answer = None
+
+    for i in range(warmup + runs):
+        timings = dict()
+        answer = solution(read_input(filename), parts, timings)
+
+        if i < warmup:
+            continue
+        for phase, elapsed in timings.items():
+            samples.setdefault(phase, []).append(elapsed)
+
+    return samples, answer
+
+
+def peak_memory(day: int, filename: Path, parts: tuple[int, ...]) -> int:
+    """Peak memory in bytes allocated while solving, measured in an extra run."""
+    input_ = read_input(filename)
+    tracemalloc.start()
+    try:
+        load_solution(day)(input_, parts)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def fingerprint() -> dict[str, str | int]:
+    """Describes the machine a benchmark ran on."""
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def benchmark(
+    days: list[int],
+    runs: int,
+    warmup: int,
+    inputs: Path | None,
+    parts: tuple[int, ...] = (1, 2),
+) -> dict:
+    results = dict()
+    for day in days:
+        try:
+            filename = find_input(day, inputs)
+            samples, solution = time_day(day, filename, runs, warmup, parts)
+            peak = peak_memory(day, filename, parts)
+        except (NotImplementedError, IndexError):
+            sys.stderr.write("aoc bench: skipping day %s: not implemented\n" % day)
+            continue
+        except FileNotFoundError as e:
+            sys.stderr.write("aoc bench: skipping day %s: %s\n" % (day, e))
+            continue
+        results[str(day)] = {
+            "answer": {"part1": solution.part1, "part2": solution.part2},
+            "phases": {phase: summarize(times) for phase, times in samples.items()},
+            "peak_memory": peak,
+        }
+    return {"runs": runs, "warmup": warmup, "machine": fingerprint(), "days": results}
+
+
+def baseline(report: dict) -> dict:
+    """Reduces a report to what later runs are compared against."""
+    days = dict()
+    for day, result in report["days"].items():
+        days[day] = {
+            "answer": result["answer"],
+            "median": {p: stats["median"] for p, stats in result["phases"].items()},
+            "peak_memory": result["peak_memory"],
+        }
+    return {"machine": report["machine"], "days": days}
+
+
+def compare(report: dict, base: dict, tolerance: float) -> list[str]:
+    """Lists every way `report` regressed from `base`: a day no longer solved, a
+    changed answer, a phase median or peak memory more than `tolerance` percent
+    above the baseline.
+    """
+    limit = 1 + tolerance / 100
+    regressions = []
+    for day, expected in base["days"].items():
+        if (result := report["days"].get(day)) is None:
+            regressions.append(f"day {day}: missing from report")
+            continue
+
+        if result["answer"] != expected["answer"]:
+            regressions.append(
+                f"day {day}: answer {result['answer']} != {expected['answer']}"
+            )
+
+        for phase, before in expected["median"].items():
+            if phase not in result["phases"]:
+                continue
+            after = result["phases"][phase]["median"]
+            if after > before * limit and after - before > NOISE_FLOOR:
+                regressions.append(
+                    f"day {day}: {phase} {before * 1000:.3f}ms -> {after * 1000:.3f}ms "
+                    f"(+{(after / before - 1) * 100:.0f}%)"
+                )
+
+        before = expected["peak_memory"]
+        after = result["peak_memory"]
+        if after > before * limit:
+            regressions.append(
+                f"day {day}: peak memory {before / 1024:.1f} KiB -> "
+                f"{after / 1024:.1f} KiB (+{(after / before - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def render(report: dict) -> str:
+    header = f"{'day':>3}  {'phase':<6} {'min':>10} {'median':>10} {'p95':>10} {'stddev':>10}"
+    output = [header, "-" * len(header)]
+    for day, result in report["days"].items():
+        for phase, stats in result["phases"].items():
+            times = " ".join(
+                f"{stats[k] * 1000:>8.3f}ms" for k in ("min", "median", "p95", "stddev")
+            )
+            output.append(f"{day:>3}  {phase:<6} {times}")
+        output.append(
+            f"{day:>3}  {'memory':<6} {result['peak_memory'] / 1024:>8.1f}KiB"
+        )
+    return "\n".join(output)
+
+
+def main(argv: list[str]) -> int:
+    args = parser.parse_args(argv)
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+
+    days = parse_days(args.days)
+    parts = (1, 2) if args.part is None else (args.part,)
+    if args.scale is None:
+        report = benchmark(days, args.runs, args.warmup, args.inputs, parts)
+    else:
+        scale = generators.parse_scale(args.scale)
+        with TemporaryDirectory() as inputs:
+            for day in days:
+                if day in generators.GENERATORS.keys():
+                    filename = Path(inputs) / f"{day:02}.txt"
+                    generators.write(day, filename, scale, args.seed)
+            report = benchmark(days, args.runs, args.warmup, Path(inputs), parts)
+        report["scale"] = scale
+        report["seed"] = args.seed
+    print(render(report))
+
+    if args.json is not None:
+        with args.json.open("w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline is not None:
+        with args.save_baseline.open("w") as f:
+            json.dump(baseline(report), f, indent=2)
+
+    if args.compare is not None:
+        with args.compare.open() as f:
+            base = json.load(f)
+        if base["machine"] != report["machine"]:
+            sys.stderr.write("aoc bench: warning: baseline is from another machine\n")
+        if regressions := compare(report, base, args.tolerance):
+            raise RegressionError(
+                "%d regression(s) beyond %s%%:\n  %s"
+                % (len(regressions), args.tolerance, "\n  ".join(regressions))
+            )
+        print(f"No regressions beyond {args.tolerance}% against {args.compare}")
+    return 0
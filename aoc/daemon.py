@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from runner import read_input
+from solutions import available_days, load_solution, solve
+from solutions.shared import PuzzleInput, Solution
+
+SOCKET_PATH = Path(".aoc.sock")
+
+# Errors raised again by the client with their original type
+REMOTE_ERRORS = {
+    e.__name__: e
+    for e in (FileNotFoundError, IndexError, NotImplementedError, ValueError)
+}
+
+parser = argparse.ArgumentParser(
+    prog="aoc serve",
+    description="Keep solutions warm and solve requests over a Unix socket",
+)
+
+parser.add_argument(
+    "-s",
+    "--socket",
+    type=Path,
+    default=SOCKET_PATH,
+    help="Path of the Unix socket to listen on (default %(default)s).",
+)
+parser.add_argument(
+    "-w",
+    "--workers",
+    type=int,
+    help="Worker processes solving requests. Defaults to one per core.",
+)
+
+
+def _warm():
+    """Imports every solution module so requests never pay for an import."""
+    for day in available_days():
+        load_solution(day)
+
+
+def _solve_request(request: dict) -> dict:
+    """Solves a request holding a day, optional parts, and an input file path or
+    the input text itself.
+    """
+    if "path" in request:
+        input_ = read_input(Path(request["path"]))
+        if not input_.path.exists():
+            raise FileNotFoundError("input file does not exist: '%s'" % input_.path)
+    else:
+        input_ = PuzzleInput.from_lines(request["input"].splitlines())
+
+    parts = tuple(request.get("parts", (1, 2)))
+    solution = solve(request["day"], input_, parts)
+    return {"part1": solution.part1, "part2": solution.part2}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Reads one JSON request per line and answers each with one JSON line."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = self.server.pool.submit(_solve_request, request).result()
+            except Exception as e:
+                response = {"error": str(e), "type": type(e).__name__}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path: Path = SOCKET_PATH, workers: int | None = None):
+    """Serves solve requests until interrupted."""
+    if socket_path.exists():
+        socket_path.unlink()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm) as pool:
+        with _Server(str(socket_path), _Handler) as server:
+            server.pool = pool
+            try:
+                server.serve_forever()
+            finally:
+                socket_path.unlink(missing_ok=True)
+
+
+def request(
+    day: int,
+    filename: Path,
+    parts: tuple[int, ...] = (1, 2),
+    socket_path: Path = SOCKET_PATH,
+) -> Solution:
+    """Asks a running daemon to solve a day. Raises ConnectionError if no daemon
+    is listening on `socket_path`.
+    """
+    payload = {"day": day, "path": os.path.abspath(filename), "parts": list(parts)}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except (FileNotFoundError, OSError) as e:
+            raise ConnectionError("no daemon listening on '%s'" % socket_path) from e
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(payload).encode() + b"\n")
+            stream.flush()
+            response = json.loads(stream.readline())
+
+    if "error" in response:
+        raise REMOTE_ERRORS.get(response["type"], RuntimeError)(response["error"])
+    return Solution(response["part1"], response["part2"])
+
+
+def solve_with_daemon(
+    day: int,
+    filename: Path,
+    parts: tuple[int, ...] = (1, 2),
+    socket_path: Path = SOCKET_PATH,
+) -> Solution:
+    """Solves through the daemon, falling back to solving in this process when
+    no daemon is running.
+    """
+    try:
+        return request(day, filename, parts, socket_path)
+    except ConnectionError:
+        return solve(day, read_input(filename), parts)
+
+
+def main(argv: list[str]) -> int:
+    args = parser.parse_args(argv)
+    # Stop cleanly on SIGTERM as well as Ctrl-C, removing the socket
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    print(f"Listening on {args.socket}", flush=True)
+    try:
+        serve(args.socket, args.workers)
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -1,28 +1,120 @@
+import os
+import threading
 from pathlib import Path
-from urllib.request import Request, urlopen
 
 CACHE_FOLDER = Path(".inputs")
 COOKIE_TOKEN = Path(".token")
+BASE_URL = "https://adventofcode.com"
+MAX_CONCURRENCY = 4
+
+
+def input_path(day: int) -> Path:
+    return CACHE_FOLDER / Path(f"{day:02}.txt")
 
 
 def download_input(day: int, year: int = 2021) -> Path:
     CACHE_FOLDER.mkdir(parents=True, exist_ok=True)
-    filename = CACHE_FOLDER / Path(f"{day:02}.txt")
+    filename = input_path(day)
 
     if filename.exists():
         print(f"Using cached input {filename}")
         return filename
 
+    from urllib.request import Request, urlopen
+
     with open(COOKIE_TOKEN) as f:
-        token = f.read()
+        token = f.read().strip()
 
-    url = f"https://adventofcode.com/{year}/day/{day}/input"
+    url = f"{BASE_URL}/{year}/day/{day}/input"
 
     req = Request(url)
     req.add_header("Cookie", token)
     content = urlopen(req).read()
 
-    with open(filename, "wb") as f:
-        f.write(content)
+    _write_atomic(filename, content)
 
     return filename
+
+
+def prefetch(
+    days: list[int],
+    year: int = 2021,
+    concurrency: int = MAX_CONCURRENCY,
+    base_url: str = BASE_URL,
+) -> list[Path]:
+    """Downloads every missing input for `days` concurrently.
+
+    Each worker thread keeps one keep-alive connection to `base_url` and reuses
+    it for all of its downloads. Inputs already in the cache are not fetched.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    CACHE_FOLDER.mkdir(parents=True, exist_ok=True)
+    missing = [d for d in days if not input_path(d).exists()]
+    if missing:
+        with open(COOKIE_TOKEN) as f:
+            token = f.read().strip()
+
+        session = _Session(base_url, token)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # Consume results so worker errors are raised here
+            list(pool.map(lambda d: session.download(d, year), missing))
+
+    return [input_path(d) for d in days]
+
+
+class _Session:
+    """Pool of keep-alive HTTP connections, one per thread."""
+
+    def __init__(self, base_url: str, token: str):
+        from urllib.parse import urlsplit
+
+        url = urlsplit(base_url)
+        self.scheme = url.scheme
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.token = token
+        self.local = threading.local()
+
+    def _connection(self, fresh: bool = False) -> "HTTPConnection":
+        from http.client import HTTPConnection, HTTPSConnection
+
+        if fresh or getattr(self.local, "connection", None) is None:
+            if (old := getattr(self.local, "connection", None)) is not None:
+                old.close()
+            cls = HTTPSConnection if self.scheme == "https" else HTTPConnection
+            self.local.connection = cls(self.netloc)
+        return self.local.connection
+
+    def _get(self, path: str, fresh: bool = False) -> (int, str, bytes, dict):
+        connection = self._connection(fresh)
+        connection.request("GET", path, headers={"Cookie": self.token})
+        response = connection.getresponse()
+        return response.status, response.reason, response.read(), response.headers
+
+    def download(self, day: int, year: int) -> Path:
+        from http.client import RemoteDisconnected
+        from urllib.error import HTTPError
+
+        path = f"{self.prefix}/{year}/day/{day}/input"
+        try:
+            status, reason, content, headers = self._get(path)
+        except (RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            # Server closed the idle keep-alive connection, retry on a new one
+            status, reason, content, headers = self._get(path, fresh=True)
+
+        if status != 200:
+            url = f"{self.scheme}://{self.netloc}{path}"
+            raise HTTPError(url, status, reason, headers, None)
+
+        filename = input_path(day)
+        _write_atomic(filename, content)
+        return filename
+
+
+def _write_atomic(filename: Path, content: bytes):
+    # Write then rename so a failed download never leaves a partial input behind
+    tmp = filename.with_name(f"{filename.name}.{os.getpid()}.{threading.get_ident()}")
+    with open(tmp, "wb") as f:
+        f.write(content)
+    os.replace(tmp, filename)
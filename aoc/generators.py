@@ -0,0 +1,413 @@
+import argparse
+import random
+import string
+import sys
+from itertools import permutations, product
+from math import isqrt
+from pathlib import Path
+from typing import Callable
+
+parser = argparse.ArgumentParser(
+    prog="aoc generate",
+    description="Generate synthetic puzzle inputs of a chosen size",
+)
+
+parser.add_argument("day", type=int, help="Day to generate input for.")
+parser.add_argument(
+    "-s",
+    "--scale",
+    default="1x",
+    help="Size relative to a real puzzle input, e.g. '10x' or '0.5' (default 1x).",
+)
+parser.add_argument(
+    "--seed", type=int, default=0, help="Random seed (default %(default)s)."
+)
+parser.add_argument(
+    "-o", "--output", type=Path, help="Write input to this file instead of stdout."
+)
+
+GENERATORS: dict[int, Callable[[random.Random, float], list[str]]] = dict()
+
+
+def generator(day: int):
+    """Registers a function producing input lines for `day` at a given scale.
+    Scale multiplies the natural size of a real input: lines, grid cells,
+    boards, scanners and so on.
+    """
+
+    def register(fn):
+        GENERATORS[day] = fn
+        return fn
+
+    return register
+
+
+def parse_scale(scale: str) -> float:
+    value = float(scale.removesuffix("x"))
+    if value <= 0:
+        raise ValueError("scale must be positive: '%s'" % scale)
+    return value
+
+
+def generate(day: int, scale: float = 1.0, seed: int = 0) -> list[str]:
+    """Generates a valid input for `day`, the same every time for a given seed."""
+    if day not in GENERATORS.keys():
+        raise IndexError("no input generator for day: '%s'" % day)
+    return GENERATORS[day](random.Random(seed), scale)
+
+
+def write(day: int, filename: Path, scale: float = 1.0, seed: int = 0) -> Path:
+    with open(filename, "w") as f:
+        f.writelines(f"{line}\n" for line in generate(day, scale, seed))
+    return filename
+
+
+def _count(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def _side(base: int, scale: float) -> int:
+    # Grid side length so the number of cells grows with scale
+    return max(2, isqrt(round(base * base * scale)))
+
+
+def _digit_grid(rng: random.Random, side: int, digits: str) -> list[str]:
+    return ["".join(rng.choices(digits, k=side)) for _ in range(side)]
+
+
+@generator(1)
+def sonar_sweep(rng: random.Random, scale: float) -> list[str]:
+    depth = rng.randint(100, 200)
+    lines = []
+    for _ in range(_count(2000, scale)):
+        depth = max(0, depth + rng.randint(-8, 12))
+        lines.append(str(depth))
+    return lines
+
+
+@generator(2)
+def dive(rng: random.Random, scale: float) -> list[str]:
+    directions = rng.choices(
+        ["forward", "down", "up"], [5, 3, 2], k=_count(1000, scale)
+    )
+    return [f"{d} {rng.randint(1, 9)}" for d in directions]
+
+
+@generator(3)
+def binary_diagnostic(rng: random.Random, scale: float) -> list[str]:
+    count = _count(1000, scale)
+    width = max(12, count.bit_length() + 2)
+    numbers = rng.sample(range(2**width), count)
+    return [f"{n:0{width}b}" for n in numbers]
+
+
+@generator(4)
+def giant_squid(rng: random.Random, scale: float) -> list[str]:
+    draws = list(range(100))
+    rng.shuffle(draws)
+    lines = [",".join(str(d) for d in draws)]
+    for _ in range(_count(100, scale)):
+        numbers = rng.sample(range(100), 25)
+        lines.append("")
+        for row in range(5):
+            lines.append(" ".join(f"{n:>2}" for n in numbers[row * 5 : row * 5 + 5]))
+    return lines
+
+
+@generator(5)
+def hydrothermal_venture(rng: random.Random, scale: float) -> list[str]:
+    size = _side(1000, scale)
+    lines = []
+    for _ in range(_count(500, scale)):
+        x0, y0 = rng.randrange(size), rng.randrange(size)
+        dx, dy = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1), (-1, 0), (0, -1)])
+
+        # Longest segment in this direction that stays on the map
+        limit = min(
+            (size - 1 - p if d > 0 else p) for p, d in ((x0, dx), (y0, dy)) if d
+        )
+        if limit == 0:
+            dx, dy = -dx, -dy
+            limit = min(
+                (size - 1 - p if d > 0 else p) for p, d in ((x0, dx), (y0, dy)) if d
+            )
+        length = rng.randint(1, min(limit, size // 2))
+        lines.append(f"{x0},{y0} -> {x0 + dx * length},{y0 + dy * length}")
+    return lines
+
+
+@generator(6)
+def lanternfish(rng: random.Random, scale: float) -> list[str]:
+    return [",".join(str(rng.randint(1, 5)) for _ in range(_count(300, scale)))]
+
+
+@generator(7)
+def treachery_of_whales(rng: random.Random, scale: float) -> list[str]:
+    count = _count(1000, scale)
+    top = 2 * count
+    return [",".join(str(int(rng.triangular(0, top, 0))) for _ in range(count))]
+
+
+DIGIT_SEGMENTS = (
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+)
+
+
+@generator(8)
+def seven_segment_search(rng: random.Random, scale: float) -> list[str]:
+    lines = []
+    for _ in range(_count(200, scale)):
+        wires = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(digit: int) -> str:
+            segments = [wires[s] for s in DIGIT_SEGMENTS[digit]]
+            rng.shuffle(segments)
+            return "".join(segments)
+
+        patterns = [scramble(d) for d in rng.sample(range(10), 10)]
+        output = [scramble(rng.randrange(10)) for _ in range(4)]
+        lines.append(f"{' '.join(patterns)} | {' '.join(output)}")
+    return lines
+
+
+@generator(9)
+def smoke_basin(rng: random.Random, scale: float) -> list[str]:
+    return _digit_grid(rng, _side(100, scale), "0123456789999")
+
+
+BRACKETS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+
+@generator(10)
+def syntax_scoring(rng: random.Random, scale: float) -> list[str]:
+    lines = []
+    for _ in range(_count(100, scale)):
+        chars = []
+        stack = []
+        for _ in range(rng.randint(40, 110)):
+            if stack and rng.random() < 0.45:
+                chars.append(stack.pop())
+            else:
+                opening = rng.choice("([{<")
+                chars.append(opening)
+                stack.append(BRACKETS[opening])
+
+        # Corrupt about half the lines with a mismatched closing character
+        closing = [i for i, c in enumerate(chars) if c in BRACKETS.values()]
+        if closing and rng.random() < 0.5:
+            i = rng.choice(closing)
+            chars[i] = rng.choice([c for c in ")]}>" if c != chars[i]])
+        elif not stack:
+            chars.append(rng.choice("([{<"))
+        lines.append("".join(chars))
+    return lines
+
+
+@generator(11)
+def dumbo_octopus(rng: random.Random, scale: float) -> list[str]:
+    return _digit_grid(rng, _side(10, scale), string.digits)
+
+
+@generator(12)
+def passage_pathing(rng: random.Random, scale: float) -> list[str]:
+    names = ["".join(p) for p in product(string.ascii_lowercase, repeat=2)]
+    small = rng.sample(names, min(len(names), max(2, _count(5, scale))))
+    big = [n.upper() for n in rng.sample(names, min(len(names), _count(2, scale)))]
+
+    # Big caves are never connected to each other, or paths would be infinite
+    edges = set()
+    for cave in small + ["start", "end"]:
+        edges.add((cave, rng.choice(big)))
+    for a, b in permutations(small + ["start", "end"], 2):
+        if rng.random() < 0.15 and (b, a) not in edges:
+            edges.add((a, b))
+    return [f"{a}-{b}" for a, b in edges if {a, b} != {"start", "end"}]
+
+
+@generator(13)
+def transparent_origami(rng: random.Random, scale: float) -> list[str]:
+    # Fold lines from the innermost out, unfolding a 40x6 code area
+    x_folds = [40]
+    while len(x_folds) < 5:
+        x_folds.append(2 * x_folds[-1] + 1)
+    y_folds = [6]
+    while len(y_folds) < 7:
+        y_folds.append(2 * y_folds[-1] + 1)
+
+    points = set()
+    for _ in range(_count(800, scale)):
+        x, y = rng.randrange(40), rng.randrange(6)
+        for fold in x_folds:
+            if rng.random() < 0.5:
+                x = 2 * fold - x
+        for fold in y_folds:
+            if rng.random() < 0.5:
+                y = 2 * fold - y
+        points.add((x, y))
+
+    folds = [f"fold along x={f}" for f in reversed(x_folds)]
+    folds += [f"fold along y={f}" for f in reversed(y_folds)]
+    return [f"{x},{y}" for x, y in points] + [""] + folds
+
+
+@generator(14)
+def extended_polymerization(rng: random.Random, scale: float) -> list[str]:
+    elements = "BCFHKNOPSV"
+    template = "".join(rng.choices(elements, k=_count(20, scale)))
+    rules = [
+        f"{a}{b} -> {rng.choice(elements)}" for a, b in product(elements, repeat=2)
+    ]
+    return [template, ""] + rules
+
+
+@generator(15)
+def chiton(rng: random.Random, scale: float) -> list[str]:
+    return _digit_grid(rng, _side(100, scale), "123456789")
+
+
+def _packet(rng: random.Random, budget: int) -> str:
+    version = f"{rng.randrange(8):03b}"
+    if budget <= 1 or rng.random() < 0.2:
+        value = rng.getrandbits(rng.randint(1, 32))
+        groups = f"{value:b}".zfill(-(-value.bit_length() // 4) * 4 or 4)
+        chunks = [groups[i : i + 4] for i in range(0, len(groups), 4)]
+        body = "".join(f"1{c}" for c in chunks[:-1]) + f"0{chunks[-1]}"
+        return f"{version}100{body}"
+
+    type_ = rng.choice([0, 1, 2, 3, 5, 6, 7])
+    count = 2 if type_ >= 5 else min(rng.randint(1, 6), budget - 1)
+    children = "".join(_packet(rng, (budget - 1) // count) for _ in range(count))
+    if len(children) < 2**15 and rng.random() < 0.5:
+        return f"{version}{type_:03b}0{len(children):015b}{children}"
+    return f"{version}{type_:03b}1{count:011b}{children}"
+
+
+@generator(16)
+def packet_decoder(rng: random.Random, scale: float) -> list[str]:
+    bits = _packet(rng, _count(60, scale))
+    bits += "0" * (-len(bits) % 4)
+    return ["".join(f"{int(bits[i : i + 4], 2):X}" for i in range(0, len(bits), 4))]
+
+
+@generator(17)
+def trick_shot(rng: random.Random, scale: float) -> list[str]:
+    x0 = _count(rng.randint(150, 250), scale)
+    y0 = -_count(rng.randint(60, 110), scale)
+    x1 = x0 + _count(rng.randint(20, 60), scale)
+    y1 = y0 + _count(rng.randint(20, 50), scale)
+    return [f"target area: x={x0}..{x1}, y={y0}..{min(y1, -1)}"]
+
+
+def _snailfish(rng: random.Random, depth: int) -> str:
+    if depth >= 4 or (depth > 0 and rng.random() < 0.3):
+        return str(rng.randrange(10))
+    return f"[{_snailfish(rng, depth + 1)},{_snailfish(rng, depth + 1)}]"
+
+
+@generator(18)
+def snailfish(rng: random.Random, scale: float) -> list[str]:
+    return [_snailfish(rng, 0) for _ in range(_count(100, scale))]
+
+
+def _rotations() -> list[Callable]:
+    """The 24 rotations of 3D space, as axis permutations with signs."""
+    rotations = []
+    for axes in permutations(range(3)):
+        # Parity of the permutation decides which sign flips keep handedness
+        parity = sum(axes[i] > axes[j] for i in range(3) for j in range(i + 1, 3)) % 2
+        for signs in product((1, -1), repeat=3):
+            if (signs[0] * signs[1] * signs[2] == 1) == (parity == 0):
+                rotations.append((axes, signs))
+    return rotations
+
+
+@generator(19)
+def beacon_scanner(rng: random.Random, scale: float) -> list[str]:
+    scanners = [(0, 0, 0)]
+    beacons = set()
+
+    def random_point(center, low=-1000, high=1000):
+        return tuple(c + rng.randint(low, high) for c in center)
+
+    for _ in range(_count(30, scale) - 1):
+        parent = scanners[-1]
+        offset = [rng.randint(-1100, 1100) for _ in range(3)]
+        offset[rng.randrange(3)] = rng.choice((-1, 1)) * rng.randint(800, 1100)
+        scanner = tuple(p + o for p, o in zip(parent, offset))
+
+        # At least 12 beacons in the region both scanners can see
+        low = [max(p, s) - 1000 for p, s in zip(parent, scanner)]
+        high = [min(p, s) + 1000 for p, s in zip(parent, scanner)]
+        for _ in range(12):
+            beacons.add(tuple(rng.randint(lo, hi) for lo, hi in zip(low, high)))
+        scanners.append(scanner)
+
+    for scanner in scanners:
+        for _ in range(14):
+            beacons.add(random_point(scanner))
+
+    rotations = _rotations()
+    lines = []
+    for i, scanner in enumerate(scanners):
+        axes, signs = rotations[0] if i == 0 else rng.choice(rotations)
+        lines.append(f"--- scanner {i} ---")
+        for beacon in beacons:
+            relative = [b - s for b, s in zip(beacon, scanner)]
+            if max(abs(r) for r in relative) > 1000:
+                continue
+            rotated = [signs[k] * relative[axes[k]] for k in range(3)]
+            lines.append(",".join(str(r) for r in rotated))
+        lines.append("")
+    return lines[:-1]
+
+
+@generator(20)
+def trench_map(rng: random.Random, scale: float) -> list[str]:
+    algorithm = rng.choices("#.", k=512)
+    # Lit background flips each step, like real inputs
+    algorithm[0], algorithm[511] = "#", "."
+    return ["".join(algorithm), ""] + _digit_grid(rng, _side(100, scale), "#.")
+
+
+@generator(21)
+def dirac_dice(rng: random.Random, scale: float) -> list[str]:
+    return [f"Player {p} starting position: {rng.randint(1, 10)}" for p in (1, 2)]
+
+
+@generator(22)
+def reactor_reboot(rng: random.Random, scale: float) -> list[str]:
+    lines = []
+    for i in range(_count(420, scale)):
+        state = "on" if i < 2 or rng.random() < 0.6 else "off"
+        if i < 20:
+            ranges = [sorted(rng.randint(-50, 50) for _ in range(2)) for _ in "xyz"]
+        else:
+            ranges = []
+            for _ in "xyz":
+                start = rng.randint(-100000, 100000)
+                ranges.append((start, start + rng.randint(1000, 50000)))
+        dims = ",".join(f"{a}={lo}..{hi}" for a, (lo, hi) in zip("xyz", ranges))
+        lines.append(f"{state} {dims}")
+    return lines
+
+
+def main(argv: list[str]) -> int:
+    args = parser.parse_args(argv)
+    scale = parse_scale(args.scale)
+
+    if args.output is not None:
+        write(args.day, args.output, scale, args.seed)
+    else:
+        sys.stdout.writelines(
+            f"{line}\n" for line in generate(args.day, scale, args.seed)
+        )
+    return 0
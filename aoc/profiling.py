@@ -0,0 +1,99 @@
+import io
+from pathlib import Path
+from typing import Any, Callable
+
+PROFILE_FOLDER = Path(".profiles")
+# Seconds between samples of the traced memory size while profiling memory
+SAMPLE_INTERVAL = 0.005
+
+
+def profile_cpu(day: int, fn: Callable, *args, directory: Path, top: int) -> (Any, str):
+    """Runs `fn` under cProfile, dumping dayXX.prof and a table of the hottest functions."""
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args)
+
+    profiler.dump_stats(directory / f"day{day:02}.prof")
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return result, stream.getvalue()
+
+
+def profile_mem(day: int, fn: Callable, *args, directory: Path, top: int) -> (Any, str):
+    """Runs `fn` under tracemalloc, reporting peak memory and the top allocation
+    sites at the peak.
+
+    Memory a solve frees before returning never shows up in a snapshot taken
+    afterwards, so a background thread samples the traced size every
+    SAMPLE_INTERVAL seconds and snapshots whenever it reaches a new high. The
+    sites are those of the largest sample, which can be up to one interval
+    away from the exact peak.
+    """
+    import threading
+    import tracemalloc
+
+    highest = None
+    highest_size = -1
+    done = threading.Event()
+
+    def sample():
+        nonlocal highest, highest_size
+        while True:
+            # Checked once more after `fn` returns, in case it peaks at the end
+            finished = done.wait(SAMPLE_INTERVAL)
+            current, _ = tracemalloc.get_traced_memory()
+            if current > highest_size:
+                highest = tracemalloc.take_snapshot()
+                highest_size = current
+            if finished:
+                return
+
+    tracemalloc.start()
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        result = fn(*args)
+    finally:
+        done.set()
+        sampler.join()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    snapshot = highest.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    output = [
+        f"Day {day} peak memory: {peak / 1024:.1f} KiB",
+        f"Allocation sites at {highest_size / 1024:.1f} KiB:",
+        "",
+    ]
+    for stat in snapshot.statistics("lineno")[:top]:
+        output.append(str(stat))
+    return result, "\n".join(output) + "\n"
+
+
+PROFILERS = {"cpu": profile_cpu, "mem": profile_mem}
+
+
+def profile(
+    kind: str,
+    day: int,
+    fn: Callable,
+    *args,
+    directory: Path = PROFILE_FOLDER,
+    top: int = 20,
+) -> (Any, str):
+    """Profiles a call to `fn` and writes the report to dayXX.<kind>.txt in `directory`."""
+    directory.mkdir(parents=True, exist_ok=True)
+    result, report = PROFILERS[kind](day, fn, *args, directory=directory, top=top)
+    with open(directory / f"day{day:02}.{kind}.txt", "w") as f:
+        f.write(report)
+    return result, report
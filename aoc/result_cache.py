@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from downloader import CACHE_FOLDER
+from solutions import solution_sources
+from solutions.shared import PuzzleInput, Solution
+
+RESULT_FOLDER = CACHE_FOLDER / Path("results")
+MAX_ENTRIES = 256
+
+
+class ResultCache:
+    """On-disk store of solutions keyed by day, parts solved, input content and
+    solution source.
+
+    Editing the input or any source file the day depends on changes the key, so
+    stale entries are never returned. Entries are evicted least recently used
+    first once there are more than `max_entries` of them.
+    """
+
+    def __init__(self, folder: Path = RESULT_FOLDER, max_entries: int = MAX_ENTRIES):
+        self.folder = folder
+        self.max_entries = max_entries
+
+    def key(
+        self, day: int, input_: PuzzleInput, parts: tuple[int, ...] = (1, 2)
+    ) -> str:
+        source = hashlib.sha256()
+        for filename in solution_sources(day):
+            source.update(filename.read_bytes())
+
+        content = hashlib.sha256()
+        with input_.buffer() as buffer:
+            content.update(buffer)
+
+        parts = ",".join(str(p) for p in parts)
+        key = f"{day}:{parts}:{content.hexdigest()}:{source.hexdigest()}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str) -> Solution | None:
+        filename = self.folder / f"{key}.json"
+        try:
+            with open(filename) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Mark as recently used for eviction. The entry read above is still valid
+        # if another process evicted the file since.
+        try:
+            os.utime(filename)
+        except FileNotFoundError:
+            pass
+        return Solution(entry["part1"], entry["part2"])
+
+    def put(self, key: str, day: int, solution: Solution):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        entry = {"day": day, "part1": solution.part1, "part2": solution.part2}
+
+        # Write then rename so concurrent readers never see a partial entry
+        tmp = self.folder / f"{key}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self.folder / f"{key}.json")
+
+        self._evict()
+
+    def _evict(self):
+        # Another process may evict an entry between listing and stat
+        entries = []
+        for filename in self.folder.glob("*.json"):
+            try:
+                entries.append((filename.stat().st_mtime, filename))
+            except FileNotFoundError:
+                continue
+        entries.sort(reverse=True)
+        for _, filename in entries[self.max_entries :]:
+            filename.unlink(missing_ok=True)
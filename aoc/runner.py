@@ -0,0 +1,156 @@
+from pathlib import Path
+from time import perf_counter
+
+from profiling import PROFILE_FOLDER, profile as profile_call
+from result_cache import ResultCache
+from solutions import available_days, load_solution, solve
+from solutions.shared import PuzzleInput, Solution
+
+# Rough relative cost of the slower days, so batch runs can start them first.
+EXPECTED_COST = {
+    19: 100,
+    20: 80,
+    15: 60,
+    22: 40,
+    18: 30,
+    12: 20,
+    11: 10,
+    14: 10,
+    17: 10,
+    21: 10,
+    9: 5,
+}
+
+
+def parse_days(spec: str) -> list[int]:
+    """Parses a day selection like '5', '1-22', '1,3,5-7' or 'all'."""
+    if spec == "all":
+        return available_days()
+
+    days = set()
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        start = int(first)
+        stop = int(last) if last else start
+        if start > stop:
+            raise ValueError("invalid day range: '%s'" % part)
+        days.update(range(start, stop + 1))
+    return sorted(days)
+
+
+def find_input(day: int, directory: Path | None = None) -> Path:
+    """Locates puzzle input for a day, downloading it if no directory is given."""
+    if directory is None:
+        from downloader import download_input
+
+        return download_input(day)
+
+    filename = directory / Path(f"{day:02}.txt")
+    if not filename.exists():
+        raise FileNotFoundError("input file does not exist: '%s'" % filename)
+    return filename
+
+
+def read_input(filename: Path) -> PuzzleInput:
+    return PuzzleInput.from_path(filename)
+
+
+def cached_solve(
+    day: int,
+    input_: PuzzleInput,
+    cache: ResultCache,
+    parts: tuple[int, ...] = (1, 2),
+) -> Solution:
+    """Returns the cached solution for this day and input, solving it on a miss."""
+    key = cache.key(day, input_, parts)
+    if (solution := cache.get(key)) is not None:
+        return solution
+
+    solution = solve(day, input_, parts)
+    cache.put(key, day, solution)
+    return solution
+
+
+def solve_day(
+    day: int,
+    filename: Path,
+    profile: str | None = None,
+    profile_dir: Path = PROFILE_FOLDER,
+    top: int = 20,
+    use_cache: bool = True,
+    parts: tuple[int, ...] = (1, 2),
+) -> (Solution, float):
+    """Solves a single day from an input file, returning the solution and wall time.
+    With `profile` set to 'cpu' or 'mem' the solve is profiled and its report
+    written to `profile_dir`. Profiled solves never use the result cache.
+    """
+    start = perf_counter()
+    input_ = read_input(filename)
+    if profile is None and use_cache:
+        solution = cached_solve(day, input_, ResultCache(), parts)
+    elif profile is None:
+        solution = solve(day, input_, parts)
+    else:
+        solution, _ = profile_call(
+            profile,
+            day,
+            load_solution(day),
+            input_,
+            parts,
+            directory=profile_dir,
+            top=top,
+        )
+    return solution, perf_counter() - start
+
+
+def run_batch(
+    days: list[int],
+    inputs: Path | None = None,
+    jobs: int | None = None,
+    **options,
+) -> dict[int, (Solution | Exception, float)]:
+    """Solves several days across a process pool. Extra `options` are passed to
+    `solve_day` for every day.
+
+    Days expected to be slowest are submitted first so the total wall time
+    approaches that of the slowest day instead of the sum of all days. Each
+    day's input is located in its own job, so a missing input is reported as
+    that day's error rather than aborting the batch.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    schedule = sorted(days, key=lambda d: EXPECTED_COST.get(d, 1), reverse=True)
+
+    results = dict()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(_solve_batch_day, d, inputs, **options): d for d in schedule
+        }
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                results[day] = future.result()
+            except Exception as e:
+                results[day] = (e, 0.0)
+    return dict(sorted(results.items()))
+
+
+def _solve_batch_day(day: int, inputs: Path | None, **options) -> (Solution, float):
+    return solve_day(day, find_input(day, inputs), **options)
+
+
+def render_batch(results: dict[int, (Solution | Exception, float)], wall: float) -> str:
+    header = f"{'day':>3}  {'part 1':>16} {'part 2':>16} {'time':>10}"
+    output = [header, "-" * len(header)]
+    for day, (solution, elapsed) in results.items():
+        if isinstance(solution, Exception):
+            output.append(f"{day:>3}  error: {solution!r}")
+            continue
+        part1, part2 = (
+            "-" if p is None else p for p in (solution.part1, solution.part2)
+        )
+        output.append(f"{day:>3}  {part1!s:>16} {part2!s:>16} {elapsed * 1000:>8.1f}ms")
+    output.append("-" * len(header))
+    total = sum(elapsed for _, elapsed in results.values())
+    output.append(f"total {total:.3f}s in {wall:.3f}s wall time")
+    return "\n".join(output)
@@ -1,33 +1,123 @@
-import pkgutil
-import re
-from importlib import import_module
-from importlib.util import find_spec
-from pathlib import Path
-from typing import Callable
-
-from .shared import Solution
-
-SOLUTION_REGEX = re.compile(r"day(?P<day>\d+)")
-
-
-def solve(day: int, input_: list[str]) -> Solution:
-    """Run solution for a given day."""
-
-    solution_registry = _find_solutions()
-    if day not in solution_registry.keys():
-        raise IndexError("day not implemented yet: '%s'" % day)
-
-    return solution_registry[day](input_)
-
-
-def _find_solutions() -> dict[int, Callable[[list[str]], Solution]]:
-    """Walks `solutions` package directory finding all modules with a name like dayXX.
-    Will then register the `main` function for each day in a dictionary.
-    """
-    solution_map = dict()
-    for pkg in pkgutil.iter_modules(find_spec(__name__).submodule_search_locations):
-        if match := SOLUTION_REGEX.fullmatch(pkg.name):
-            module = import_module(f".{pkg.name}", package=__name__)
-            day = int(match.group("day"))
-            solution_map[day] = getattr(module, "main")
-    return solution_map
+import pkgutil
+import re
+from functools import cache
+from importlib import import_module
+from importlib.util import find_spec
+from pathlib import Path
+from time import perf_counter
+from types import ModuleType
+
+from .shared import PuzzleInput, Solution
+
+SOLUTION_REGEX = re.compile(r"day(?P<day>\d+)")
+
+
+def solve(
+    day: int, input_: PuzzleInput | list[str], parts: tuple[int, ...] = (1, 2)
+) -> Solution:
+    """Run solution for a given day."""
+    return load_solution(day)(input_, parts)
+
+
+def available_days() -> list[int]:
+    """Days with a solution module, in order. Does not import any of them."""
+    return sorted(_solution_index().keys())
+
+
+def solution_sources(day: int) -> list[Path]:
+    """Source files a day's answers depend on: its own module and every module of
+    this package that is not a solution, such as `shared`. Nothing is imported.
+    """
+    if day not in _solution_index().keys():
+        raise IndexError("day not implemented yet: '%s'" % day)
+
+    modules = [_solution_index()[day]]
+    for pkg in pkgutil.iter_modules(find_spec(__name__).submodule_search_locations):
+        if not SOLUTION_REGEX.fullmatch(pkg.name):
+            modules.append(pkg.name)
+    sources = [Path(find_spec(f".{m}", __name__).origin) for m in modules]
+    return sources + [Path(find_spec(__name__).origin)]
+
+
+@cache
+def _solution_index() -> dict[int, str]:
+    """Walks `solutions` package directory finding all modules with a name like dayXX.
+    Only module names are recorded, so nothing is imported until a day is requested.
+    """
+    index = dict()
+    for pkg in pkgutil.iter_modules(find_spec(__name__).submodule_search_locations):
+        if match := SOLUTION_REGEX.fullmatch(pkg.name):
+            index[int(match.group("day"))] = pkg.name
+    return index
+
+
+class Day:
+    """Runs a dayXX module on a puzzle input.
+
+    A module either defines `main(input_) -> Solution`, or leaves out `main` and
+    defines `parse(input_)`, `part1(parsed)` and `part2(parsed)`. The second form
+    lets each part run on its own, sharing one parse when both are requested.
+    Input is passed in the form named by the module's INPUT_FORMAT ('lines'
+    when not set).
+    """
+
+    def __init__(self, module: ModuleType):
+        self.main = getattr(module, "main", None)
+        self.input_format = getattr(module, "INPUT_FORMAT", "lines")
+        if self.main is None:
+            self.parse = getattr(module, "parse")
+            self.parts = {1: getattr(module, "part1"), 2: getattr(module, "part2")}
+
+    def __call__(
+        self,
+        input_: PuzzleInput | list[str],
+        parts: tuple[int, ...] = (1, 2),
+        timings: dict[str, float] | None = None,
+    ) -> Solution:
+        """Solves the requested parts. Parts not requested are left as None.
+        If `timings` is given, the seconds spent in each phase are stored in it,
+        starting with 'input' for reading the input into INPUT_FORMAT.
+        """
+        if not isinstance(input_, PuzzleInput):
+            input_ = PuzzleInput.from_lines(input_)
+        if timings is None:
+            timings = dict()
+
+        start = perf_counter()
+
+        def solve(data):
+            timings["input"] = perf_counter() - start
+            return self._solve(data, parts, timings)
+
+        return input_.feed(solve, self.input_format)
+
+    def _solve(
+        self, data, parts: tuple[int, ...], timings: dict[str, float]
+    ) -> Solution:
+        solution = Solution(None, None)
+
+        if self.main is not None:
+            start = perf_counter()
+            answers = self.main(data)
+            timings["solve"] = perf_counter() - start
+            for part in parts:
+                setattr(solution, f"part{part}", getattr(answers, f"part{part}"))
+            return solution
+
+        start = perf_counter()
+        parsed = self.parse(data)
+        timings["parse"] = perf_counter() - start
+        for part in parts:
+            start = perf_counter()
+            setattr(solution, f"part{part}", self.parts[part](parsed))
+            timings[f"part{part}"] = perf_counter() - start
+        return solution
+
+
+@cache
+def load_solution(day: int) -> Day:
+    """Imports the module for a single day."""
+    if day not in _solution_index().keys():
+        raise IndexError("day not implemented yet: '%s'" % day)
+
+    return Day(import_module(f".{_solution_index()[day]}", package=__name__))
@@ -1,33 +1,113 @@
+import operator
 from collections import deque
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from itertools import islice, repeat
+from pathlib import Path
 
-from .shared import Solution
+from .shared import (
+    BLOCK_SIZE,
+    CHUNK_SIZE,
+    PuzzleInput,
+    Solution,
+    line_chunks,
+    map_chunks,
+    parse_ints,
+)
 
+INPUT_FORMAT = "input"
 
-def main(lines: list[str]) -> Solution:
-    lines = [int(x) for x in lines]
-    return Solution(
-        count_increases(lines, 1),
-        count_increases(lines, 3),
+
+def main(input_: PuzzleInput) -> Solution:
+    if input_.is_large():
+        return Solution(*count_increases_parallel(input_.path, 1, 3))
+
+    with input_.buffer() as buffer:
+        blocks = (buffer[start:end] for start, end in line_chunks(buffer, BLOCK_SIZE))
+        return Solution(*count_increases_chunked(blocks, 1, 3))
+
+
+def count_increases(depths: Iterable[int], *windows: int) -> tuple[int, ...]:
+    """Counts increases in sliding window sums for each window size in one pass.
+
+    Consecutive windows of size w share all but one depth, so the sum increases
+    exactly when x[i] > x[i - w]. Only the last max(windows) depths are kept,
+    making each depth O(1) per window however large the windows are.
+    """
+    history = deque(maxlen=max(windows))
+    counts = [0] * len(windows)
+    sizes = list(enumerate(windows))
+
+    for n in depths:
+        for i, w in sizes:
+            if len(history) >= w and n > history[-w]:
+                counts[i] += 1
+        history.append(n)
+    return tuple(counts)
+
+
+def count_increases_vectorized(depths: Sequence[int], *windows: int) -> tuple[int, ...]:
+    """Same counts as `count_increases` for depths already in memory. Each window
+    compares the sequence against itself shifted by w with `map(operator.gt)`,
+    which runs in C rather than in a Python loop.
+    """
+    return tuple(
+        sum(map(operator.gt, islice(depths, w, None), depths)) for w in windows
     )
 
 
-def count_increases(lines: Iterable[int], window: int):
-    deck = deque(maxlen=window)
-    first = True
-    count = 0
-    prev = 0
-
-    for n in lines:
-        deck.append(n)
-        if len(deck) < window:
-            continue
-        total = sum(deck)
-        if first:
-            prev = total
-            first = False
-            continue
-        if total > prev:
-            count += 1
-        prev = total
-    return count
+def count_increases_chunked(chunks: Iterable[bytes], *windows: int) -> tuple[int, ...]:
+    """Same counts as `count_increases` for depths, one per line, split into
+    chunks of whole lines. Each chunk is parsed and counted on its own with
+    `count_increases_vectorized`, so only one chunk's depths are held at once.
+    """
+    reach = max(windows)
+    return _join_chunks(
+        map(_count_chunk, chunks, repeat(windows), repeat(reach)), windows
+    )
+
+
+def count_increases_parallel(
+    path: Path, *windows: int, jobs: int | None = None, chunk_size: int = CHUNK_SIZE
+) -> tuple[int, ...]:
+    """Same counts as `count_increases` for a file of depths, one per line.
+
+    The file is split into newline-aligned chunks that worker processes map and
+    count on their own, so it never has to fit in memory.
+    """
+    reach = max(windows)
+    results = map_chunks(
+        _count_chunk, path, windows, reach, jobs=jobs, chunk_size=chunk_size
+    )
+    return _join_chunks(results, windows)
+
+
+def _join_chunks(
+    results: Iterable[(tuple[int, ...], list[int], list[int])], windows: tuple[int, ...]
+) -> tuple[int, ...]:
+    """Adds up the counts of consecutive chunks. Comparisons that reach back
+    across a chunk boundary are counted here from the first and last
+    max(windows) depths of each chunk.
+    """
+    reach = max(windows)
+    counts = [0] * len(windows)
+    previous = []
+
+    for chunk_counts, head, tail in results:
+        joined = previous + head
+        for i, w in enumerate(windows):
+            counts[i] += chunk_counts[i]
+            # Depths of this chunk compared with ones before it
+            for j in range(len(previous), min(len(joined), len(previous) + w)):
+                if j >= w and joined[j] > joined[j - w]:
+                    counts[i] += 1
+        previous = (previous + tail)[-reach:]
+
+    return tuple(counts)
+
+
+def _count_chunk(
+    chunk: bytes, windows: tuple[int, ...], reach: int
+) -> (tuple[int, ...], list[int], list[int]):
+    depths = parse_ints(chunk)
+    counts = count_increases_vectorized(depths, *windows)
+    return counts, depths[:reach].tolist(), depths[-reach:].tolist()
@@ -1,21 +1,25 @@
 from dataclasses import dataclass
+from functools import reduce
+from pathlib import Path
 
-from .shared import Solution
+from .shared import (
+    BLOCK_SIZE,
+    CHUNK_SIZE,
+    PuzzleInput,
+    Solution,
+    line_chunks,
+    map_chunks,
+)
 
-
-@dataclass
-class Move:
-    direction: str
-    distance: int
-
-    @staticmethod
-    def from_input(input: str):
-        dir_, dist = input.split(" ")
-        return Move(dir_, int(dist))
+INPUT_FORMAT = "input"
 
 
 @dataclass
 class Position:
+    """Net effect of a run of moves: the distance and depth gained, and the aim
+    gained along the way. Part 1 reads the aim as a plain depth.
+    """
+
     distance: int = 0
     depth: int = 0
     aim: int = 0
@@ -23,26 +27,56 @@ class Position:
     def product(self):
         return self.distance * self.depth
 
-    def move(self, movement: Move):
-        match movement:
-            case Move("forward", distance):
-                self.distance += distance
-                self.depth += self.aim * distance
-            case Move("up", distance):
-                self.aim -= distance
-            case Move("down", distance):
-                self.aim += distance
+    def then(self, other: "Position") -> "Position":
+        """Effect of making this run of moves followed by `other`. Forward moves
+        in `other` also dive by the aim gained here, so runs can be followed
+        separately and combined in order afterwards.
+        """
+        return Position(
+            self.distance + other.distance,
+            self.depth + other.depth + self.aim * other.distance,
+            self.aim + other.aim,
+        )
+
+
+def course(data: bytes) -> Position:
+    """Follows every move in one pass over the words of `data`, without parsing
+    a line into any object.
+    """
+    distance = depth = aim = 0
+    words = iter(data.split())
+    for direction, amount in zip(words, words):
+        n = int(amount)
+        match direction[0]:
+            case 0x66:  # forward
+                distance += n
+                depth += aim * n
+            case 0x64:  # down
+                aim += n
+            case 0x75:  # up
+                aim -= n
+    return Position(distance, depth, aim)
 
 
-def main(input_: list[str]) -> Solution:
-    movements = (Move.from_input(x) for x in input_)
+def course_parallel(
+    path: Path, jobs: int | None = None, chunk_size: int = CHUNK_SIZE
+) -> Position:
+    """Same as `course` for a file of moves, followed chunk by chunk in worker
+    processes that each map the file on their own.
+    """
+    positions = map_chunks(course, path, jobs=jobs, chunk_size=chunk_size)
+    return reduce(Position.then, positions, Position())
 
-    position = Position()
-    for m in movements:
-        position.move(m)
 
-    print(f"Position: {position.distance}")
-    print(f"Depth: {position.depth}")
-    print(f"Answer: {position.product()}")
+def main(input_: PuzzleInput) -> Solution:
+    if input_.is_large():
+        position = course_parallel(input_.path)
+    else:
+        # Followed block by block, so only one block's words are held at once
+        with input_.buffer() as buffer:
+            blocks = (
+                buffer[start:end] for start, end in line_chunks(buffer, BLOCK_SIZE)
+            )
+            position = reduce(Position.then, map(course, blocks), Position())
 
-    return Solution()
+    return Solution(position.distance * position.aim, position.product())
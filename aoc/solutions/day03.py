@@ -1,70 +1,129 @@
-from functools import reduce
-
-from .shared import Solution
-
-
-def frequency(input_: list[str]) -> list[int]:
-    wordsize = len(input_[0])
-    freq = [0] * wordsize
-
-    for measure in input_:
-        for i in range(wordsize):
-            freq[i] += int(measure[i])
-
-    return freq
-
-
-def part1(input_) -> tuple[int, int]:
-    freq = frequency(input_)
-
-    threshold = len(input_) / 2
-
-    gamma = ["1" if x >= threshold else "0" for x in freq]
-    epsilon = ["0" if x >= threshold else "1" for x in freq]
-
-    return (int("".join(gamma), 2), int("".join(epsilon), 2))
-
-
-def filter(input_: list[str], filter_: list[str]) -> int:
-    print(filter_)
-    for i in range(len(filter_)):
-        input_ = [x for x in input_ if x[i] == filter_[i]]
-        print(input_)
-        if len(input_) == 1:
+import mmap
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import cached_property
+
+INPUT_FORMAT = "buffer"
+
+# Bytes of the report held in memory at once while counting columns
+BLOCK_SIZE = 2**20
+
+
+@dataclass
+class Report:
+    """Diagnostic report of equally wide binary numbers, one per line. Lines end
+    with LF or CRLF, the same throughout, and the last may have no line ending.
+    """
+
+    data: bytes | mmap.mmap
+
+    @cached_property
+    def stride(self) -> int:
+        """Bytes from the start of one line to the next, line ending included."""
+        end = self.data.find(b"\n")
+        # A single line without a line ending reads as if it had one
+        return (len(self.data) if end == -1 else end) + 1
+
+    @cached_property
+    def width(self) -> int:
+        return len(self.data[: self.stride - 1].rstrip())
+
+    @cached_property
+    def frequency(self) -> list[int]:
+        return column_counts(self.data, self.width, self.stride)
+
+    @cached_property
+    def values(self) -> list[int] | array:
+        """Every number as a packed integer, sorted. Numbers that fit take 8 bytes
+        each in an array, wider ones are kept as Python ints.
+        """
+        values = sorted(int(word, 2) for word in self.data[:].split())
+        return array("Q", values) if self.width <= 64 else values
+
+    def __len__(self) -> int:
+        # The last line may or may not have its line ending
+        ending = self.stride - self.width
+        return (len(self.data) + ending) // self.stride
+
+
+def column_counts(
+    data: bytes | mmap.mmap,
+    width: int,
+    stride: int | None = None,
+    block_size: int = BLOCK_SIZE,
+) -> list[int]:
+    """Count of 1s in each column, reading `data` one block of whole lines at a
+    time. Every line takes `stride` bytes (width + 1 by default), so within a
+    block a column is a stride slice counted in C. Only one block is ever copied
+    out of a memory-mapped report, however large the report is.
+    """
+    line = width + 1 if stride is None else stride
+    block = max(1, block_size // line) * line
+    counts = [0] * width
+    for start in range(0, len(data), block):
+        chunk = data[start : start + block]
+        # Every whole line must end where the first one does
+        if chunk[line - 1 :: line].count(b"\n") != len(chunk) // line:
+            raise ValueError("report lines differ in width or line ending")
+        for i in range(width):
+            counts[i] += chunk[i::line].count(b"1")
+    return counts
+
+
+def rates(report: Report) -> tuple[int, int]:
+    threshold = len(report) / 2
+
+    gamma = 0
+    for count in report.frequency:
+        gamma = (gamma << 1) | (count >= threshold)
+    epsilon = gamma ^ ((1 << report.width) - 1)
+
+    return (gamma, epsilon)
+
+
+def rating(values: list[int] | array, width: int, most: bool) -> int:
+    """Keeps the numbers with the most (or least) common bit at each position,
+    from the highest bit down, until one remains.
+
+    `values` is sorted, so numbers sharing their high bits are a contiguous range
+    that splits in two by the next bit. The range is narrowed with a binary
+    search per bit, without copying any numbers.
+    """
+    lo, hi = 0, len(values)
+    for bit in reversed(range(width)):
+        if hi - lo == 1:
             break
-    return int(input_[0], 2)
+        # First number in the range with this bit set
+        prefix = values[lo] >> (bit + 1) << (bit + 1)
+        split = bisect_left(values, prefix | (1 << bit), lo, hi)
+        ones = hi - split
+        zeros = split - lo
+        if zeros == 0 or ones == 0:
+            continue
+        if (ones >= zeros) == most:
+            lo = split
+        else:
+            hi = split
+    return values[lo]
 
 
-def filter(input_: list[str], index: int, most: bool) -> list[str]:
-    freq = 0
-    for m in input_:
-        freq += int(m[index])
-    if most:
-        filter_ = "1" if freq >= len(input_) / 2 else "0"
-    else:
-        filter_ = "0" if freq >= len(input_) / 2 else "1"
-    return [x for x in input_ if x[index] == filter_]
+def ratings(report: Report) -> tuple[int, int]:
+    return (
+        rating(report.values, report.width, True),
+        rating(report.values, report.width, False),
+    )
 
 
-def part2(input_) -> tuple[int, int]:
-    wordsize = len(input_[0])
+def parse(input_: bytes | mmap.mmap) -> Report:
+    return Report(input_)
 
-    o2 = input_.copy()
-    for i in range(wordsize):
-        o2 = filter(o2, i, True)
-        if len(o2) == 1:
-            break
-
-    co2 = input_.copy()
-    for i in range(wordsize):
-        co2 = filter(co2, i, False)
-        if len(co2) == 1:
-            break
 
-    return (int(o2[0], 2), int(co2[0], 2))
+def part1(report: Report) -> int:
+    gamma, epsilon = rates(report)
+    return gamma * epsilon
 
 
-def main(input_: list[str]):
-    rates = part1(input_)
-    lf = part2(input_)
-    return Solution(rates[0] * rates[1], lf[0] * lf[1])
+def part2(report: Report) -> int:
+    o2, co2 = ratings(report)
+    return o2 * co2
@@ -1,101 +1,157 @@
-from .shared import Solution
+import mmap
+from array import array
+from collections import defaultdict
+from collections.abc import Sequence
+from itertools import repeat
 
+from .shared import Solution, parse_ints
 
-class Board:
-    def __init__(self, numbers: list[int]):
+INPUT_FORMAT = "buffer"
+
+SIZE = 5
+
+# Games with at least this many boards are scored in one batch. Fewer boards are
+# played draw by draw, which needs less setup than ranking the whole deck.
+BATCH_THRESHOLD = 3
+
+
+class Bingo:
+    """Every board of a bingo game, stored flat: board b holds cells
+    b * SIZE**2 to (b + 1) * SIZE**2, row by row.
+
+    Drawing a number only visits the cells holding it, found through an index
+    built once. Each board keeps a hit counter per row and column, so a line is
+    complete on the mark that takes its counter to SIZE.
+    """
+
+    def __init__(self, numbers: Sequence[int]):
+        cells = SIZE * SIZE
         self.numbers = numbers
-        self.marked = [False] * len(numbers)
-        self.width = 5
-        self.win = False
-
-    def mark(self, number: int):
-        try:
-            self.marked[self.numbers.index(number)] = True
-        except ValueError:
-            pass
-
-    def check_horizontal(self):
-        for row in range(5):
-            pos = row * self.width
-            if all(self.marked[pos : pos + self.width]):
-                return True
-        return False
-
-    def check_vertical(self):
-        for col in range(5):
-            if all(
-                [
-                    self.marked[col],
-                    self.marked[col + 5],
-                    self.marked[col + 10],
-                    self.marked[col + 15],
-                    self.marked[col + 20],
-                ]
+        self.boards = len(numbers) // cells
+
+        self.index: dict[int, list[int]] = defaultdict(list)
+        for cell, n in enumerate(numbers):
+            self.index[n].append(cell)
+
+        # SIZE row counters then SIZE column counters per board
+        self.hits = bytearray(self.boards * 2 * SIZE)
+        self.won = bytearray(self.boards)
+        self.unmarked = array(
+            "q", (sum(numbers[b * cells : (b + 1) * cells]) for b in range(self.boards))
+        )
+
+    def draw(self, number: int) -> list[int]:
+        """Marks `number` on every board, returning the boards it made win."""
+        winners = []
+        for cell in self.index.pop(number, ()):
+            board, pos = divmod(cell, SIZE * SIZE)
+            row, col = divmod(pos, SIZE)
+            self.unmarked[board] -= number
+
+            counters = board * 2 * SIZE
+            self.hits[counters + row] += 1
+            self.hits[counters + SIZE + col] += 1
+            if self.won[board]:
+                continue
+            if (
+                self.hits[counters + row] == SIZE
+                or self.hits[counters + SIZE + col] == SIZE
             ):
-                return True
-        return False
-
-    def check_win(self):
-        self.win = self.check_horizontal() or self.check_vertical()
-        return self.win
-
-    def score(self, last_num: int):
-        both = zip(self.numbers, self.marked)
-        unmarked = [int(n) for n, m in both if not m]
-        return sum(unmarked) * int(last_num)
-
-    def __str__(self):
-        output = []
-        i = 0
-        for n in self.numbers:
-            if i % 5 == 0:
-                output.append("\n")
-            output.append(str(n))
-            i += 1
-
-        i = 0
-        for m in self.marked:
-            if i % 5 == 0:
-                output.append("\n")
-            output.append("x" if m else "o")
-            i += 1
-        return " ".join(output)
-
-    def __repr__(self):
-        return f"Board({self.numbers}, {self.marked})"
-
-
-def read_input(lines: list[str]) -> (list[int], list[Board]):
-    deck = [l.rstrip("\n").split(",") for l in lines]
-    with open("test.txt", "r") as f:
-        deck = f.readline()
-        boards = []
-
-        f.readline()
-
-        acc = []
-        while line := f.readline():
-            l = line.split()
-            if l:
-                acc = acc + l
-            else:
-                boards.append(Board(acc))
-                acc = []
-        boards.append(Board(acc))
-
-    return (deck, boards)
-
-
-def main(input_: list[str]) -> Solution:
-    deck, boards = read_input(input_)
-
+                self.won[board] = 1
+                winners.append(board)
+        return winners
+
+    def score(self, board: int, last_num: int) -> int:
+        return self.unmarked[board] * last_num
+
+
+def draw_turns(deck: Sequence[int]) -> dict[int, int]:
+    """Turn on which each number is first drawn."""
+    return {n: turn for turn, n in reversed(list(enumerate(deck)))}
+
+
+def win_turns(deck: Sequence[int], numbers: Sequence[int]) -> list[int]:
+    """Turn on which each board wins, or len(deck) if it never does.
+
+    With every number replaced by the turn it is drawn on, a line completes on
+    the largest turn in it and a board wins on the smallest of those over its
+    lines. Each step is a map of max or min over stride slices that line up
+    the cells of every board at once, with no loop over the draws.
+    """
+    cells = SIZE * SIZE
+    ranks = list(map(draw_turns(deck).get, numbers, repeat(len(deck))))
+
+    # Rows are runs of SIZE cells, so the k-th cells of every row are ranks[k::SIZE]
+    rows = list(map(max, *(ranks[k::SIZE] for k in range(SIZE))))
+    # Cell r of column c of every board is at c + r * SIZE, then every 25 cells
+    columns = [
+        map(max, *(ranks[c + r * SIZE :: cells] for r in range(SIZE)))
+        for c in range(SIZE)
+    ]
+    return list(map(min, *(rows[r::SIZE] for r in range(SIZE)), *columns))
+
+
+def batch_scores(
+    deck: Sequence[int], numbers: Sequence[int]
+) -> (int | None, int | None):
+    """Scores of the first and last boards to win, from `win_turns`. Boards
+    winning on the same turn win in board order. A board that never wins, or
+    no board at all, scores None.
+    """
+    cells = SIZE * SIZE
+    turns = win_turns(deck, numbers)
+    if not turns:
+        return None, None
+    rank = draw_turns(deck)
+
+    def score(board: int) -> int | None:
+        turn = turns[board]
+        if turn == len(deck):
+            return None
+        board_numbers = numbers[board * cells : (board + 1) * cells]
+        unmarked = sum(n for n in board_numbers if rank.get(n, len(deck)) > turn)
+        return unmarked * deck[turn]
+
+    first = turns.index(min(turns))
+    last = len(turns) - 1 - turns[::-1].index(max(turns))
+    return score(first), score(last)
+
+
+def indexed_scores(
+    deck: Sequence[int], numbers: Sequence[int]
+) -> (int | None, int | None):
+    """Same scores as `batch_scores`, playing the game draw by draw on the
+    indexed `Bingo` engine and stopping once the last board wins.
+    """
+    bingo = Bingo(numbers)
+
+    first = None
+    last = None
+    remaining = bingo.boards
     for n in deck:
-        print(f"Call: {n}")
-        for b in boards:
-            b.mark(n)
-            print(b)
-            b.check_win()
-            if all([w.win for w in boards]):
-                print(f"Win: {b.score(n)}")
-
-    return Solution()
+        winners = bingo.draw(n)
+        if not winners:
+            continue
+        if first is None:
+            first = bingo.score(winners[0], n)
+        remaining -= len(winners)
+        if remaining == 0:
+            last = bingo.score(winners[-1], n)
+            break
+
+    return first, last
+
+
+def read_input(input_: bytes | mmap.mmap) -> (array, array):
+    """The deck on the first line, then the numbers of every board in order."""
+    end = input_.find(b"\n")
+    if end == -1:
+        end = len(input_)
+    return parse_ints(input_[:end], b","), parse_ints(input_[end:])
+
+
+def main(input_: bytes | mmap.mmap) -> Solution:
+    deck, numbers = read_input(input_)
+    if len(numbers) // (SIZE * SIZE) >= BATCH_THRESHOLD:
+        return Solution(*batch_scores(deck, numbers))
+    return Solution(*indexed_scores(deck, numbers))
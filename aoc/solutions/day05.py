@@ -1,116 +1,174 @@
-import argparse
-import math
+import mmap
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from operator import countOf
 
+from .shared import parse_ints
 
-@dataclass
-class Point:
-    x: int
-    y: int
-
-
-@dataclass
-class Line:
-    p0: Point
-    p1: Point
-
-
-class Map:
-    def __init__(self, size: int):
-        self.size = size
-        self.map_ = [0] * size * size
-
-    def draw_line(self, line: Line):
-        # DDA line drawing algorithm
-        dx = line.p1.x - line.p0.x
-        dy = line.p1.y - line.p0.y
-
-        side_length = max(abs(dx), abs(dy))
-
-        x_inc = dx / side_length
-        y_inc = dy / side_length
-
-        current_x = line.p0.x
-        current_y = line.p0.y
-
-        for i in range(side_length + 1):
-            self.draw_point(round(current_x), round(current_y))
-            current_x += x_inc
-            current_y += y_inc
-
-    def draw_line_part1(self, line: Line):
-        if line.p0.x == line.p1.x:
-            x = line.p0.x
-            start = min(line.p0.y, line.p1.y)
-            end = max(line.p0.y, line.p1.y) + 1
-            for y in range(start, end):
-                self.draw_point(x, y)
-        elif line.p0.y == line.p1.y:
-            y = line.p0.y
-            start = min(line.p0.x, line.p1.x)
-            end = max(line.p0.x, line.p1.x) + 1
-            for x in range(start, end):
-                self.draw_point(x, y)
-
-    def draw_point(self, x: int, y: int):
-        self.map_[y * self.size + x] += 1
-
-    def overlaps(self):
-        return len([x for x in self.map_ if x >= 2])
-
-    def __str__(self):
-        strings = [str(x) for x in self.map_]
-        output = []
-        for i in range(0, self.size * self.size, self.size):
-            output.append(" ".join(strings[i : i + self.size]))
-        return "\n".join(output)
-
-
-def read_input(filepath: str) -> (list[Line], int):
-    with open(filepath, "r") as f:
-        max_ = 0
-        lines = []
-        for line in f.readlines():
-            data = line.split()
-            x0 = int(data[0].split(",")[0])
-            y0 = int(data[0].split(",")[1])
-            x1 = int(data[-1].split(",")[0])
-            y1 = int(data[-1].split(",")[1])
-
-            if max_ < max(x0, y0, x1, y1):
-                max_ = max(x0, y0, x1, y1)
-
-            a = Point(x0, y0)
-            b = Point(x1, y1)
-            lines.append(Line(a, b))
-
-    return lines, max_ + (10 - max_ % 10)
-
-
-def init_parser() -> str:
-    parser = argparse.ArgumentParser(description="Advent of Code day 5 solution.")
-    parser.add_argument(
-        "input", metavar="FILE", type=str, nargs=1, help="Path to input data."
-    )
-    args = parser.parse_args()
-    return os.path.realpath(args.input[0])
+INPUT_FORMAT = "buffer"
 
+# Maps a point's count to its count after one more segment, stopping at 2
+SATURATE = bytes([1, 2] + [2] * 254)
 
-if __name__ == "__main__":
-    path = init_parser()
+# Segments are drawn on a dense board when they cover at least one point in
+# this many of its points, and counted sparsely otherwise
+SPARSITY = 128
+# Boards with fewer points than this are drawn in this process
+PARALLEL_THRESHOLD = 2**24
+# Bytes of a shared memory band copied out at once to count its points
+COUNT_BLOCK = 2**20
 
-    lines, max_ = read_input(path)
 
-    map_ = Map(max_)
+def parse_coordinates(input_: bytes | mmap.mmap) -> list[int]:
+    """Every coordinate of every segment, x0 y0 x1 y1 in turn."""
+    return parse_ints(input_[:].replace(b"->", b" ").replace(b",", b" "))
 
-    for line in lines:
-        # map_.draw_line_part1(line)
-        map_.draw_line(line)
 
-    # print(map_, end='\n\n')
-    print(f"Overlaps: {map_.overlaps()}")
-
-
-def main(_):
-    raise NotImplementedError
+@dataclass
+class Vents:
+    """Segments as ranges of flat point keys y * width + x. Every segment is
+    horizontal, vertical or at 45 degrees, so its points are evenly spaced keys
+    with a step of 1, width, or width plus or minus 1.
+    """
+
+    straight: list[range]
+    diagonal: list[range]
+    width: int = 0
+    height: int = 0
+
+
+def segment(x0: int, y0: int, x1: int, y1: int, width: int) -> range:
+    dx = (x1 > x0) - (x1 < x0)
+    dy = (y1 > y0) - (y1 < y0)
+    step = dy * width + dx
+    start = y0 * width + x0
+    if step == 0:
+        # A segment of a single point
+        return range(start, start + 1)
+    return range(start, y1 * width + x1 + step, step)
+
+
+def overlaps(*segments: list[range]) -> int:
+    """Points covered by at least two segments. Only covered points are
+    counted, in C through `Counter`, so cost follows the number of points
+    rather than the size of the bounding box.
+    """
+    covered = Counter()
+    for ranges in segments:
+        for points in ranges:
+            covered.update(points)
+    return len(covered) - countOf(covered.values(), 1)
+
+
+def parse(input_: bytes | mmap.mmap) -> Vents:
+    coords = parse_coordinates(input_)
+    width = max(coords[0::2], default=0) + 1
+    height = max(coords[1::2], default=0) + 1
+
+    vents = Vents([], [], width, height)
+    for x0, y0, x1, y1 in zip(*(iter(coords),) * 4):
+        if x0 == x1 or y0 == y1:
+            vents.straight.append(segment(x0, y0, x1, y1, width))
+        else:
+            vents.diagonal.append(segment(x0, y0, x1, y1, width))
+    return vents
+
+
+def is_dense(vents: Vents, *layers: list[range]) -> bool:
+    """Whether drawing `layers` on the whole board is cheaper than counting their
+    points sparsely. Drawing costs about a byte per point of the board, counting
+    far more per point covered, so it depends on the share of the board covered.
+    """
+    points = sum(len(points) for segments in layers for points in segments)
+    return points * SPARSITY >= vents.width * vents.height
+
+
+def part1(vents: Vents) -> int:
+    if is_dense(vents, vents.straight):
+        return rasterize(vents.width, vents.height, vents.straight)[-1]
+    return overlaps(vents.straight)
+
+
+def part2(vents: Vents) -> int:
+    if is_dense(vents, vents.straight, vents.diagonal):
+        return rasterize(vents.width, vents.height, vents.straight, vents.diagonal)[-1]
+    return overlaps(vents.straight, vents.diagonal)
+
+
+def rasterize(
+    width: int, height: int, *layers: list[range], jobs: int | None = None
+) -> list[int]:
+    """Points covered by at least two segments after drawing each layer of
+    segments in turn on a dense board of one byte per point.
+
+    Each point holds 0, 1 or 2 for 'two or more'. A segment is a strided slice
+    of the board, drawn in one step by mapping the slice through SATURATE with
+    `bytes.translate`. Large boards are split into bands of rows drawn by worker
+    processes into one shared memory buffer.
+    """
+    size = width * height
+    if jobs is None:
+        jobs = os.cpu_count() if size >= PARALLEL_THRESHOLD else 1
+    rows = -(-height // jobs)
+    bands = [(r * width, min(r + rows, height) * width) for r in range(0, height, rows)]
+
+    if len(bands) <= 1:
+        return _draw(bytearray(size), 0, size, layers)
+
+    shm = SharedMemory(create=True, size=size)
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            counts = pool.map(_draw_band, repeat(shm.name), bands, repeat(layers))
+            return [sum(c) for c in zip(*counts)]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _draw_band(name: str, band: tuple[int, int], layers: tuple[list[range]]):
+    shm = SharedMemory(name=name)
+    try:
+        start, stop = band
+        return _draw(shm.buf[start:stop], start, stop, layers)
+    finally:
+        shm.close()
+
+
+def _draw(
+    board: bytearray | memoryview, lo: int, hi: int, layers: tuple[list[range]]
+) -> list[int]:
+    """Draws the parts of segments between point keys `lo` and `hi` on `board`,
+    which holds exactly those points.
+    """
+    counts = []
+    for segments in layers:
+        for points in segments:
+            if points.step < 0:
+                points = points[::-1]
+            # Keys only grow along a segment, so clipping to the band is a slice
+            first = max(0, -(-(lo - points.start) // points.step))
+            last = min(len(points), -(-(hi - points.start) // points.step))
+            if first >= last:
+                continue
+            clipped = points[first:last]
+            cells = slice(clipped.start - lo, clipped.stop - lo, clipped.step)
+            board[cells] = bytes(board[cells]).translate(SATURATE)
+        counts.append(_count_overlaps(board))
+    if isinstance(board, memoryview):
+        board.release()
+    return counts
+
+
+def _count_overlaps(board: bytearray | memoryview) -> int:
+    if isinstance(board, bytearray):
+        return board.count(b"\x02")
+    # Shared memory is only reachable through a memoryview, which cannot count,
+    # so it is copied out one block at a time
+    return sum(
+        bytes(board[i : i + COUNT_BLOCK]).count(2)
+        for i in range(0, len(board), COUNT_BLOCK)
+    )
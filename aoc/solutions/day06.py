@@ -1,7 +1,61 @@
-import argparse
-import os
+import mmap
 from collections import deque
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from functools import cache
+from operator import mul
+
+from .shared import Solution
+
+INPUT_FORMAT = "buffer"
+
+Matrix = tuple[tuple[int, ...], ...]
+
+# One day as a matrix over the count of fish with each timer value, 0 to 8.
+# Row i lists where the fish with timer i come from: timer i + 1, and for timer
+# 6 also the fish at 0 restarting, while every fish at 0 spawns one at 8.
+TRANSITION: Matrix = tuple(
+    tuple(int(j == i + 1 or (i in (6, 8) and j == 0)) for j in range(9))
+    for i in range(9)
+)
+
+
+def matmul(a: Matrix, b: Matrix) -> Matrix:
+    columns = list(zip(*b))
+    return tuple(tuple(sum(map(mul, row, col)) for col in columns) for row in a)
+
+
+def vecmat(vector: Sequence[int], m: Matrix) -> tuple[int, ...]:
+    return tuple(sum(map(mul, vector, col)) for col in zip(*m))
+
+
+# TRANSITION**(2**k) at index k, extended as longer horizons are asked for
+_POWERS: list[Matrix] = [TRANSITION]
+
+
+def transition_power(k: int) -> Matrix:
+    """TRANSITION**(2**k), squaring the largest power computed so far."""
+    while len(_POWERS) <= k:
+        _POWERS.append(matmul(_POWERS[-1], _POWERS[-1]))
+    return _POWERS[k]
+
+
+@cache
+def contributions(days: int) -> tuple[int, ...]:
+    """Fish there will be after `days` days for every fish with each timer value
+    today. The size of any population is then one dot product with these.
+
+    Sums the columns of TRANSITION**days, applying the cached power for each
+    set bit of `days` to a row of ones, in O(log days) exact products.
+    """
+    vector = (1,) * len(TRANSITION)
+    k = 0
+    while days:
+        if days & 1:
+            vector = vecmat(vector, transition_power(k))
+        days >>= 1
+        k += 1
+    return vector
 
 
 @dataclass
@@ -23,6 +77,29 @@ class Population:
             seed[a] += 1
         return Population(deque(seed, maxlen=7), deque([0, 0], maxlen=2))
 
+    @staticmethod
+    def from_histogram(histogram: Sequence[int]):
+        """Population with histogram[t] fish whose timer is t, for t up to 8."""
+        histogram = list(histogram) + [0] * (9 - len(histogram))
+        return Population(
+            deque(histogram[:7], maxlen=7), deque(histogram[7:], maxlen=2)
+        )
+
+    @staticmethod
+    def batch_sizes(
+        histograms: Iterable[Sequence[int]], days: Sequence[int]
+    ) -> list[list[int]]:
+        """Sizes of many populations, given as timer histograms, after each of
+        several day counts: one row per population, one column per day count.
+        The powered transitions are computed once for the whole batch.
+        """
+        weights = [contributions(d) for d in days]
+        return [[sum(map(mul, w, h)) for w in weights] for h in histograms]
+
+    def population_after(self, days: int) -> int:
+        """Size of the population in `days` days, without simulating each day."""
+        return sum(map(mul, contributions(days), self.to_list()))
+
     @property
     def size(self) -> int:
         return sum(self.adults) + sum(self.children)
@@ -34,32 +111,14 @@ class Population:
         return f"Population(size={self.size})"
 
 
-def read_input(filepath: str) -> list[int]:
-    with open(filepath, "r") as f:
-        return [int(n) for n in f.readline().split(",")]
-
-
-def init_parser() -> str:
-    parser = argparse.ArgumentParser(description="Advent of Code day 6 solution.")
-    parser.add_argument(
-        "input", metavar="FILE", type=str, nargs=1, help="Path to input data."
-    )
-    args = parser.parse_args()
-    return os.path.realpath(args.input[0])
-
-
-if __name__ == "__main__":
-    path = init_parser()
-    days = 256
-
-    fish = read_input(path)
-    pop = Population.from_fish_list(fish)
-    for d in range(days):
-        # print(f"Adults: {pop.adults}, Children: {pop.children}, Size: {pop.size}")
-        pop.simulate_day()
-
-    print(f"\nFish count after {days} day(s): {pop.size}")
+def histogram(input_: bytes | mmap.mmap) -> list[int]:
+    """Fish with each timer value, 0 to 8. Timers are single digits, so each is
+    counted straight from the bytes without parsing a single fish.
+    """
+    data = input_[:]
+    return [data.count(b"%d" % t) for t in range(9)]
 
 
-def main(_):
-    raise NotImplementedError
+def main(input_: bytes | mmap.mmap) -> Solution:
+    pop = Population.from_histogram(histogram(input_))
+    return Solution(pop.population_after(80), pop.population_after(256))
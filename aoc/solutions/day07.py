@@ -1,81 +1,60 @@
-import argparse
-import os
-
-
-def read_input(filepath: str) -> list[int]:
-    with open(filepath, "r") as f:
-        input_ = [int(n) for n in f.readline().split(",")]
-        input_.sort()
-        return input_
-
-
-def init_parser() -> str:
-    parser = argparse.ArgumentParser(description="Advent of Code day 7 solution.")
-    parser.add_argument(
-        "input", metavar="FILE", type=str, nargs=1, help="Path to input data."
-    )
-    args = parser.parse_args()
-    return os.path.realpath(args.input[0])
-
-
-def median(data: list[int]) -> int:
-    idx = len(data) // 2
-    return data[idx]
-
-
-def fuel_cost_part1(data: list[int], destination: int) -> int:
-    fuel = 0
-    for d in data:
-        fuel += abs(d - destination)
-    return fuel
-
-
-def fuel_cost_part2(data: list[int], destination: int) -> int:
-    fuel = 0
-    for d in data:
-        steps = abs(d - destination)
-        # 1 + 2 + 3 + ... + n = n(n + 1) / 2
-        cost = (steps * (steps + 1)) / 2
-        fuel += cost
-    return int(fuel)
-
-
-def search_field(
-    data: list[int], search_space: range, start: (int, int), cost_function: callable
-) -> (int, int):
-    best = start
-    for i in search_space:
-        new = (i, cost_function(data, i))
-        if new[1] < best[1]:
-            best = new
-        else:
-            return best
-    return best
-
-
-def find_min_fuel(data: list[int], cost_function: callable) -> (int, int):
-    med = median(data)
-
-    search_left = range(med - 1, data[0], -1)
-    search_right = range(med + 1, data[-1])
-
-    start = (med, cost_function(data, med))
-
-    best_left = search_field(data, search_left, start, cost_function)
-    best_right = search_field(data, search_right, start, cost_function)
-
-    return min(best_left, best_right, key=lambda x: x[1])
-
-
-if __name__ == "__main__":
-    path = init_parser()
-    positions = read_input(path)
-
-    # best = find_min_fuel(positions, fuel_cost_part1)
-    best = find_min_fuel(positions, fuel_cost_part2)
-
-    print(f"Best position: {best[0]} | Cost: {best[1]}")
-
-
-def main(_):
-    raise NotImplementedError
+from bisect import bisect_left
+from itertools import accumulate
+
+from .shared import Solution, parse_ints
+
+INPUT_FORMAT = "buffer"
+
+
+class Crabs:
+    """Sorted crab positions with prefix sums, answering the fuel needed to
+    align every crab on any destination without visiting each crab.
+    """
+
+    def __init__(self, positions: list[int]):
+        self.positions = sorted(positions)
+        self.prefix = list(accumulate(self.positions, initial=0))
+        self.total = self.prefix[-1]
+        self.squares = sum(p * p for p in self.positions)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def fuel_cost_part1(self, destination: int) -> int:
+        """Sum of distances to `destination`, in O(log n). Crabs left of it are
+        found by bisection, and each side's distances are a prefix sum away.
+        """
+        left = bisect_left(self.positions, destination)
+        right = len(self) - left
+        return (
+            destination * left
+            - self.prefix[left]
+            + (self.total - self.prefix[left])
+            - destination * right
+        )
+
+    def fuel_cost_part2(self, destination: int) -> int:
+        """Sum of steps * (steps + 1) / 2 over all crabs. The sum of squared
+        steps expands to sums over positions known up front, and the sum of
+        steps is the part 1 cost. The total is always even, so this is exact.
+        """
+        n = len(self)
+        squares = self.squares - 2 * destination * self.total + n * destination**2
+        return (squares + self.fuel_cost_part1(destination)) // 2
+
+    def best_part1(self) -> int:
+        # The median minimizes the sum of distances
+        return self.fuel_cost_part1(self.positions[len(self) // 2])
+
+    def best_part2(self) -> int:
+        # The cost's slope is n * (x - mean) plus at most n / 2 either way, so
+        # the best position is within half a step of the mean
+        n = len(self)
+        lo = (2 * self.total - n) // (2 * n)
+        hi = -(-(2 * self.total + n) // (2 * n))
+        return min(self.fuel_cost_part2(x) for x in range(lo, hi + 1))
+
+
+def main(input_: bytes) -> Solution:
+    crabs = Crabs(parse_ints(input_, b","))
+    return Solution(crabs.best_part1(), crabs.best_part2())
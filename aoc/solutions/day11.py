@@ -1,144 +1,91 @@
-import argparse
-import os
-import uuid
 from collections import deque
-from dataclasses import dataclass, field
+from collections.abc import Iterator
 
+from .grid import ADJACENT, Grid
+from .shared import Solution
 
-@dataclass
-class Octopus:
-    energy: int
-    flashed: bool = False
-    __id: str = field(default_factory=uuid.uuid4)
+INPUT_FORMAT = "buffer"
 
-    def __hash__(self):
-        return hash(self.__id)
-
-    def charge(self) -> int:
-        self.energy += 1
-        return self.energy
-
-    def flash(self):
-        self.energy = 0
-        self.flashed = True
-
-        global flashes
-        flashes += 1
+# Give up on a synchronized flash after this many steps
+MAX_STEPS = 1000
 
 
 class Graph:
-    def __init__(self):
-        self.nodes: dict[Octopus, set[Octopus]] = dict()
-        self.to_flash: deque[Octopus] = deque()
-
-    def add_node(self, node: Octopus, neighbors: set[Octopus]):
-        self.nodes[node] = neighbors
+    """Octopus energy levels in a grid padded with a border of 0s. Each octopus
+    is connected to the 8 cells around it by fixed flat offsets. The border
+    reads as already flashed, so it is never charged and needs no bounds check.
+    """
+
+    def __init__(self, grid: Grid):
+        self.energy = grid.padded(1)
+        self.rows = grid.height
+        self.cols = grid.width
+        width = self.energy.width
+        self.offsets = tuple(dr * width + dc for dr, dc in ADJACENT)
+        self.to_flash: deque[int] = deque()
+        self.flashes = 0
+
+    def cells(self) -> Iterator[int]:
+        # Flat indices of the original grid, skipping the border
+        width = self.energy.width
+        for r in range(width + 1, (self.rows + 1) * width, width):
+            yield from range(r, r + self.cols)
 
     def _charge_all(self):
         # Increment all energy levels
-        for o in self.nodes.keys():
-            charge = o.charge()
-            if charge > 9:
+        data = self.energy.data
+        for o in self.cells():
+            data[o] += 1
+            if data[o] > 9:
                 self.to_flash.append(o)
 
-    def _flash(self):
-        # Flash all nodes with energy > 9
+    def _flash(self) -> int:
+        # Flash all nodes with energy > 9. A flashed octopus holds 0 for the
+        # rest of the step, so it is never charged again.
+        data = self.energy.data
+        flashed = 0
         while self.to_flash:
             o = self.to_flash.popleft()
-            if o.flashed:
+            if data[o] == 0:
                 continue
-            o.flash()
-            for n in self.nodes[o]:
-                if n.flashed:
+            data[o] = 0
+            flashed += 1
+            for offset in self.offsets:
+                n = o + offset
+                if data[n] == 0:
                     continue
-                charge = n.charge()
-                if charge > 9:
+                data[n] += 1
+                if data[n] > 9:
                     self.to_flash.append(n)
-
-    def _cleanup(self):
-        # reset to_flash queue and flash state
-        self.to_flash.clear()
-        for o in self.nodes.keys():
-            o.flashed = False
-
-    def _check_sync(self):
-        return all([o.flashed for o in self.nodes.keys()])
+        return flashed
 
     def step(self) -> bool:
+        """Runs one step, returning True if every octopus flashed at once."""
         self._charge_all()
-        self._flash()
-        if self._check_sync():
-            return True
-        self._cleanup()
-        return False
+        flashed = self._flash()
+        self.flashes += flashed
+        return flashed == self.rows * self.cols
 
     def __str__(self):
-        length = 10
-        output = [str(o.energy) for o in self.nodes.keys()]
-        for i in range(length, len(output) + 1, length + 1):
-            output.insert(i, "\n")
-        return "".join(output)
-
-
-def find_neighbors(center: (int, int), grid: list[list[Octopus]]) -> set[Octopus]:
-    neighbors = set()
-    max_row = len(grid) - 1
-    max_col = len(grid[0]) - 1
-    for i in range(-1, 2):
-        for j in range(-1, 2):
-            # Constrain row and column within grid
-            row = min(max(center[0] + i, 0), max_row)
-            col = min(max(center[1] + j, 0), max_col)
-            if (row, col) == center:
-                continue
-            o = grid[row][col]
-            neighbors.add(o)
-    return neighbors
-
+        width = self.energy.width
+        return "\n".join(
+            "".join(str(v) for v in self.energy.data[r : r + self.cols])
+            for r in range(width + 1, (self.rows + 1) * width, width)
+        )
 
-def read_input(filepath: str) -> Graph:
-    grid = list()
-    with open(filepath, "r") as f:
-        for line in f.readlines():
-            grid.append([Octopus(int(n)) for n in line.rstrip()])
 
-    # Add Octopi + Neighbors to Graph
-    graph = Graph()
-    rows = len(grid)
-    cols = len(grid[0])
-    for i in range(rows):
-        for j in range(cols):
-            o = grid[i][j]
-            neighbors = find_neighbors((i, j), grid)
-            graph.add_node(o, neighbors)
+def main(input_: bytes) -> Solution:
+    graph = Graph(Grid.from_bytes(input_))
 
-    return graph
-
-
-def init_parser() -> str:
-    parser = argparse.ArgumentParser(description="Advent of Code day 11 solution.")
-    parser.add_argument(
-        "input", metavar="FILE", type=str, nargs=1, help="Path to input data."
-    )
-    args = parser.parse_args()
-    return os.path.realpath(args.input[0])
-
-
-if __name__ == "__main__":
-    flashes = 0
-    steps = 1000
-
-    path = init_parser()
-    graph = read_input(path)
-
-    for i in range(steps):
+    part1 = None
+    part2 = None
+    for step in range(1, MAX_STEPS + 1):
         synced = graph.step()
-        if synced:
-            print(f"Part 2: Synced at step {i + 1}!")
-            exit()
-
-    print(f"Part 1 flashes: {flashes}")
-
-
-def main(_):
-    raise NotImplementedError
+        if step == 100:
+            part1 = graph.flashes
+        if synced and part2 is None:
+            part2 = step
+            if part1 is not None:
+                break
+
+    return Solution(part1, part2)
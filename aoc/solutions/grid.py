@@ -0,0 +1,155 @@
+import mmap
+from array import array
+from collections.abc import Iterator, Sequence
+
+from .shared import DIGITS, parse_digits
+
+ORTHOGONAL = ((-1, 0), (0, -1), (0, 1), (1, 0))
+DIAGONAL = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+ADJACENT = ORTHOGONAL + DIAGONAL
+
+
+class Grid:
+    """Dense 2D grid of integers stored row-major in a flat `array`.
+
+    Cells are addressed either by (row, col) or by flat index
+    `row * width + col`. The typecode picks the cell size, 'b' (one byte) by
+    default, so a grid of digits costs one byte per cell.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        data: Sequence[int] | None = None,
+        typecode: str = "b",
+        fill: int = 0,
+    ):
+        self.width = width
+        self.height = height
+        if data is None:
+            self.data = array(typecode, [fill]) * (width * height)
+        else:
+            self.data = array(typecode, data)
+        if len(self.data) != width * height:
+            raise ValueError("grid data does not match %dx%d" % (width, height))
+
+    @staticmethod
+    def from_bytes(
+        data: bytes | mmap.mmap, table: bytes | None = DIGITS, typecode: str = "b"
+    ) -> "Grid":
+        """Parses newline-separated rows of equal width. Each byte is mapped
+        through `table` with `bytes.translate`, digits to their values by default.
+        """
+        width, cells = parse_digits(data, table)
+        # array only reads raw bytes directly for byte-sized cells
+        if typecode not in ("b", "B"):
+            cells = list(cells)
+        return Grid(width, len(cells) // width, cells, typecode)
+
+    @staticmethod
+    def from_lines(
+        lines: Sequence[str], table: bytes | None = DIGITS, typecode: str = "b"
+    ) -> "Grid":
+        return Grid.from_bytes("\n".join(lines).encode(), table, typecode)
+
+    def __getitem__(self, pos: tuple[int, int]) -> int:
+        return self.data[pos[0] * self.width + pos[1]]
+
+    def __setitem__(self, pos: tuple[int, int], value: int):
+        self.data[pos[0] * self.width + pos[1]] = value
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __str__(self):
+        return "\n".join(
+            "".join(str(v) for v in self.data[r : r + self.width])
+            for r in range(0, len(self.data), self.width)
+        )
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def get(self, row: int, col: int, default: int | None = None) -> int | None:
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.data[row * self.width + col]
+        return default
+
+    def rows(self) -> Iterator[array]:
+        for r in range(0, len(self.data), self.width):
+            yield self.data[r : r + self.width]
+
+    def count(self, value: int) -> int:
+        return self.data.count(value)
+
+    def neighbours(
+        self, index: int, offsets: tuple[tuple[int, int], ...] = ORTHOGONAL
+    ) -> Iterator[int]:
+        """Flat indices of the in-bounds neighbours of the cell at `index`."""
+        row, col = divmod(index, self.width)
+        for dr, dc in offsets:
+            r = row + dr
+            c = col + dc
+            if 0 <= r < self.height and 0 <= c < self.width:
+                yield r * self.width + c
+
+    def padded(self, border: int = 1, fill: int = 0) -> "Grid":
+        """Copy of the grid surrounded by `border` cells of `fill` on every side.
+        With a border, neighbours of any original cell never need bounds checks.
+        """
+        width = self.width + 2 * border
+        grid = Grid(
+            width, self.height + 2 * border, typecode=self.data.typecode, fill=fill
+        )
+        for r, row in enumerate(self.rows(), start=border):
+            start = r * width + border
+            grid.data[start : start + self.width] = row
+        return grid
+
+    def tiled(self, times: int, step: int = 1, wrap: int = 10) -> "Grid":
+        """Grid repeated `times` times in each direction. Each tile's values are
+        raised by `step` per tile away from the top left, wrapping from
+        `wrap - 1` back to 1.
+        """
+        shifted = [
+            array(
+                self.data.typecode,
+                [(v - 1 + k * step) % (wrap - 1) + 1 for v in self.data],
+            )
+            for k in range(2 * times - 1)
+        ]
+        width = self.width * times
+        grid = Grid(width, self.height * times, typecode=self.data.typecode)
+        for tr in range(times):
+            for tc in range(times):
+                tile = shifted[tr + tc]
+                for r in range(self.height):
+                    start = (tr * self.height + r) * width + tc * self.width
+                    source = r * self.width
+                    grid.data[start : start + self.width] = tile[
+                        source : source + self.width
+                    ]
+        return grid
+
+    def stencil3x3(self, table: Sequence[int], fill: int = 0) -> "Grid":
+        """Applies a 3x3 binary stencil to every cell, growing the grid by one cell
+        on each side. The 9 cells around a position, read row by row as bits of
+        a number, index `table`. Cells outside the grid read as `fill`.
+        """
+        source = self.padded(2, fill)
+        width = source.width
+        rows = list(source.rows())
+
+        # Three horizontally adjacent cells of every row as one 3-bit code
+        triples = [
+            [(a << 2) | (b << 1) | c for a, b, c in zip(row, row[1:], row[2:])]
+            for row in rows
+        ]
+        data = array(self.data.typecode)
+        for r in range(1, len(rows) - 1):
+            data.extend(
+                table[(top << 6) | (mid << 3) | bottom]
+                for top, mid, bottom in zip(triples[r - 1], triples[r], triples[r + 1])
+            )
+        return Grid(width - 2, len(rows) - 2, data, self.data.typecode)
@@ -1,10 +1,169 @@
-from dataclasses import dataclass
-
-
-@dataclass
-class Solution:
-    part1: int | str = 0
-    part2: int | str = 0
-
-    def __str__(self):
-        return f"Part 1: {self.part1}\nPart 2: {self.part2}"
+import mmap
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable
+
+# Translation table turning ASCII digits into their values
+DIGITS = bytes((b - ord("0")) % 256 for b in range(256))
+
+# Inputs at least this large are worth splitting across worker processes, a
+# chunk per task, by days that can solve a chunk on its own
+PARALLEL_THRESHOLD = 64 * 2**20
+CHUNK_SIZE = 16 * 2**20
+# Bytes of input parsed at once when reading it block by block in one process
+BLOCK_SIZE = 2**20
+
+
+@dataclass
+class Solution:
+    part1: int | str | None = 0
+    part2: int | str | None = 0
+
+    def __str__(self):
+        output = []
+        if self.part1 is not None:
+            output.append(f"Part 1: {self.part1}")
+        if self.part2 is not None:
+            output.append(f"Part 2: {self.part2}")
+        return "\n".join(output)
+
+
+class PuzzleInput:
+    """Puzzle input backed either by a file or by lines already in memory.
+
+    Solutions receive one of four forms, chosen by their INPUT_FORMAT:
+    'lines' reads everything into a list, 'stream' yields lines lazily,
+    'buffer' exposes the raw bytes, memory-mapped when backed by a file, and
+    'input' passes this object itself for solutions that pick their own form.
+    """
+
+    def __init__(self, path: Path | None = None, lines: list[str] | None = None):
+        self.path = path
+        self._lines = lines
+
+    @staticmethod
+    def from_path(path: Path) -> "PuzzleInput":
+        return PuzzleInput(path=path)
+
+    @staticmethod
+    def from_lines(lines: list[str]) -> "PuzzleInput":
+        return PuzzleInput(lines=lines)
+
+    def is_large(self) -> bool:
+        """Whether this is a file of at least PARALLEL_THRESHOLD bytes."""
+        return self.path is not None and self.path.stat().st_size >= PARALLEL_THRESHOLD
+
+    def lines(self) -> list[str]:
+        if self.path is None:
+            return self._lines
+        with self.path.open() as f:
+            return f.read().splitlines()
+
+    def stream(self) -> Iterator[str]:
+        if self.path is None:
+            yield from self._lines
+            return
+        with self.path.open() as f:
+            for line in f:
+                yield line.rstrip("\r\n")
+
+    @contextmanager
+    def buffer(self) -> Iterator[bytes | mmap.mmap]:
+        if self.path is None:
+            yield "".join(f"{line}\n" for line in self._lines).encode()
+            return
+        with self.path.open("rb") as f:
+            # Empty files cannot be mapped
+            if self.path.stat().st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
+
+    def feed(self, fn, format_: str = "lines"):
+        """Calls `fn` with this input in the given form."""
+        match format_:
+            case "lines":
+                return fn(self.lines())
+            case "stream":
+                return fn(self.stream())
+            case "buffer":
+                with self.buffer() as buffer:
+                    return fn(buffer)
+            case "input":
+                return fn(self)
+        raise ValueError("unknown input format: '%s'" % format_)
+
+
+def parse_ints(data: bytes | mmap.mmap, sep: bytes | None = None) -> array:
+    """Parses integers separated by `sep`, or by any whitespace if not given,
+    straight from bytes into an `array('q')` without decoding to str first.
+
+    `data` is split one `line_chunks` block of BLOCK_SIZE bytes at a time, so
+    besides the array only one block and its tokens are held at once.
+    """
+    ints = array("q")
+    for start, end in line_chunks(data, BLOCK_SIZE):
+        block = data[start:end]
+        if sep is None or not block.isspace():
+            ints.extend(map(int, block.split(sep)))
+    return ints
+
+
+def line_chunks(data: bytes | mmap.mmap, size: int) -> Iterator[tuple[int, int]]:
+    """Splits `data` into (start, end) offsets of chunks of about `size` bytes.
+    Every chunk but the last ends just after a newline, so no line is cut.
+    """
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n", min(start + size, len(data)) - 1)
+        end = len(data) if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def map_chunks(
+    fn: Callable,
+    path: Path,
+    *args,
+    jobs: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Any]:
+    """Calls `fn(chunk, *args)` on every `line_chunks` chunk of the file at `path`
+    in worker processes, yielding the results in file order. Each worker maps the
+    file on its own and copies out only its chunk, so the file never has to fit
+    in memory. `fn` must be a module-level function so it can be pickled.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with PuzzleInput.from_path(path).buffer() as buffer:
+        chunks = list(line_chunks(buffer, chunk_size))
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(_map_chunk, repeat(fn), repeat(path), chunks, repeat(args))
+
+
+def _map_chunk(fn: Callable, path: Path, chunk: tuple[int, int], args: tuple) -> Any:
+    start, end = chunk
+    with PuzzleInput.from_path(path).buffer() as buffer:
+        return fn(buffer[start:end], *args)
+
+
+def parse_digits(data: bytes | mmap.mmap, table: bytes | None = DIGITS) -> (int, bytes):
+    """Parses newline-separated rows of digits into the grid width and the value
+    of every digit, row after row, as one `bytes`. Another `table` maps other
+    characters to cell values the same way.
+    """
+    if isinstance(data, mmap.mmap):
+        data = data[:]
+    rows = data.split()
+    if not rows:
+        raise ValueError("no rows of digits in input")
+    cells = b"".join(rows)
+    if table is not None:
+        cells = cells.translate(table)
+    return len(rows[0]), cells